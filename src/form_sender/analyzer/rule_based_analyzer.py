@@ -27,6 +27,9 @@ from .analysis_result_builder import AnalysisResultBuilder
 
 logger = logging.getLogger(__name__)
 
+# _get_element_details の hint として流用するために必要な要素情報キー
+_DETAIL_HINT_KEYS = ("tag_name", "type", "name", "id", "placeholder")
+
 
 class RuleBasedAnalyzer:
     """ルールベースフォーム解析の全体を統括するメインクラス"""
@@ -333,21 +336,15 @@ class RuleBasedAnalyzer:
                 self.form_structure,
             )
 
-            promoted = await self.unmapped_handler.promote_required_fullname_to_mapping(
-                auto_handled, self.field_mapping
-            )
-            if promoted:
-                for k in promoted:
-                    auto_handled.pop(k, None)
-            # 追加: 必須カナの昇格（auto_unified_kana_* → 統合氏名カナ）
-            promoted_kana = (
-                await self.unmapped_handler.promote_required_kana_to_mapping(
+            # 必須の統合氏名/統合氏名カナの昇格（auto_fullname* / auto_unified_kana_*）
+            try:
+                promoted = await self.unmapped_handler.promote_all_required(
                     auto_handled, self.field_mapping
                 )
-            )
-            if promoted_kana:
-                for k in promoted_kana:
+                for k in promoted:
                     auto_handled.pop(k, None)
+            except Exception as e:
+                logger.warning(f"promote required fullname/kana skipped: {e}")
 
             # 追加: メール確認欄を field_mapping に昇格（必須セレクト等で弾かれないように）
             try:
@@ -799,9 +796,22 @@ class RuleBasedAnalyzer:
 
     # --- Helper methods passed to other classes ---
 
-    async def _get_element_details(self, element: Locator) -> Dict[str, Any]:
-        element_info = await self.element_scorer._get_element_info(element)
-        selector = await self._generate_playwright_selector(element)
+    async def _get_element_details(
+        self,
+        element: Locator,
+        selector: Optional[str] = None,
+        *,
+        hint: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        # 呼び出し側が同一パスで取得済みの要素情報（_get_element_info の結果）があれば
+        # DOM 往復（evaluate/必須判定/可視判定）を省略して流用する
+        if hint and all(k in hint for k in _DETAIL_HINT_KEYS):
+            element_info = hint
+        else:
+            element_info = await self.element_scorer._get_element_info(element)
+        # 呼び出し側で生成済みのセレクタがあれば再生成しない
+        if not selector:
+            selector = await self._generate_playwright_selector(element)
         return {
             "element": element,
             "selector": selector,
@@ -7,7 +7,7 @@ Playwrightベースでの実装（トレーシング機能付き）
 
 import asyncio
 import re
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from playwright.async_api import Page, Response
 from urllib.parse import urlparse
 
@@ -15,7 +15,7 @@ from ..utils.judgment_tracer import JudgmentTracer, JudgmentStage, JudgmentResul
 from ..utils.secure_logger import get_secure_logger
 from ..detection.prohibition_detector import ProhibitionDetector
 from ..detection.bot_detector import BotDetectionSystem
-from ..detection.pattern_matcher import FormDetectionPatternMatcher
+from ..detection.pattern_matcher import get_matcher
 
 logger = get_secure_logger(__name__)
 
@@ -44,7 +44,9 @@ class SuccessJudge:
         self.original_form_elements = []
         self.response_history = []
         self._bot_detector = BotDetectionSystem()
-        self._matcher = FormDetectionPatternMatcher()
+        self._matcher = get_matcher()
+        # 直近に判定した本文とその小文字化結果（Stage2/5 で同一本文なら小文字化を1回で済ませる）
+        self._prepared_body: Optional[Tuple[str, str]] = None
         
         # 高度営業禁止検出機能（Form Analyzer準拠）
         self.prohibition_detector = ProhibitionDetector()
@@ -661,6 +663,15 @@ class SuccessJudge:
         except Exception:
             return None
     
+    def _prepare_body(self, page_content: str) -> str:
+        """パターンマッチャ用に本文を小文字化（直前と同一の本文なら前回の結果を再利用）"""
+        cached = self._prepared_body
+        if cached is not None and cached[0] == page_content:
+            return cached[1]
+        prepared = self._matcher.prepare(page_content)
+        self._prepared_body = (page_content, prepared)
+        return prepared
+
     async def _judge_stage2_success_message(self) -> Dict[str, Any]:
         """Stage 2: 成功メッセージ判定 (85-90% accuracy)"""
         try:
@@ -682,7 +693,9 @@ class SuccessJudge:
             # configベースの成功指標（パターンマッチャ）
             config_success = False
             try:
-                config_success = self._matcher.contains_success_indicators(page_content)
+                config_success = self._matcher.contains_success_indicators_prepared(
+                    self._prepare_body(page_content)
+                )
             except Exception:
                 pass
 
@@ -993,7 +1006,7 @@ class SuccessJudge:
             
             # configベースのエラーインジケータ（簡易）
             try:
-                if self._matcher.contains_error_indicators(page_content):
+                if self._matcher.contains_error_indicators_prepared(self._prepare_body(page_content)):
                     detected_errors.setdefault('一般エラー', []).append({
                         'pattern': 'config:error_indicator',
                         'text': 'config matched'
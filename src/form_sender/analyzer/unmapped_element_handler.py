@@ -1,6 +1,16 @@
+"""未マッピング要素の自動処理
+
+要素情報・要素詳細・必須判定は handle_unmapped_elements の1パス内で要素単位に
+キャッシュされる。同一パス内の昇格処理（promote_required_*）はこれを再利用するため、
+自動処理時に判定済みの要素に対して CDP 往復を再発行しない。
+"""
+
+import asyncio
 import logging
-from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+import re
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Iterable, Tuple
 from playwright.async_api import Page, Locator, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Error as PlaywrightError
 
 from .element_scorer import ElementScorer
 from .context_text_extractor import ContextTextExtractor
@@ -8,9 +18,178 @@ from .field_combination_manager import FieldCombinationManager
 from .form_structure_analyzer import FormStructure
 from config.manager import get_prefectures, get_choice_priority_config
 from ..utils.privacy_consent_handler import PrivacyConsentHandler
+from ..utils.token_matcher import build_automaton, contains_any
 
 logger = logging.getLogger(__name__)
 
+# 確認用メールアドレス判定の語彙（小文字・不変）
+_EMAIL_CONFIRM_ATTR_PATTERNS = (
+    "email_confirm",
+    "mail_confirm",
+    "email_confirmation",
+    "confirm_email",
+    "confirm_mail",
+    "mail2",
+    "mail_2",
+    "email2",
+    "email_2",
+    "confirm-mail",
+    "email-confirm",
+    "from2",
+    "email_check",
+    "mail_check",
+    "re_email",
+    "re_mail",
+)
+_EMAIL_CONFIRM_CTX_TOKENS = ("確認", "確認用", "再入力", "再度", "もう一度")
+_EMAIL_CONFIRM_BLACKLIST = (
+    "captcha",
+    "image_auth",
+    "spam-block",
+    "token",
+    "otp",
+    "verification",
+)
+_EMAIL_TOKENS = ("email", "e-mail", "mail", "メール")
+
+# 構造フォールバックの確認欄指標 / 統合カナのひらがな指標（入力は小文字化済み）
+_CONFIRM_STRUCT_RE = re.compile(
+    r"確認|確認用|再入力|もう一度|confirm|confirmation|re_email|re_mail|email2|mail2"
+)
+_HIRAGANA_RE = re.compile(r"ひらがな|hiragana")
+
+# name[0]/name[1], kana[] 形式の配列入力名
+_ARR_RE = re.compile(r"^(name|kana)\[(\d*)\]$")
+
+# auto_handled エントリの共通部分（copy() して要素固有の値を埋める）
+_ENTRY_PROTO_EMAIL = {
+    "input_type": "email",
+    "auto_action": "copy_from",
+    "copy_from_field": "メールアドレス",
+    "default_value": "",
+    "auto_handled": True,
+}
+_ENTRY_PROTO_TEXT = {
+    "input_type": "text",
+    "default_value": "",
+    "auto_handled": True,
+}
+_ENTRY_PROTO_FILL = {
+    "input_type": "text",
+    "auto_action": "fill",
+    "default_value": "",
+    "auto_handled": True,
+}
+
+
+def _make_handled_entry(
+    proto: Dict[str, Any],
+    el: Locator,
+    selector: str,
+    info: Dict[str, Any],
+    *,
+    default_type: str,
+    required: bool,
+    **extra: Any,
+) -> Dict[str, Any]:
+    """プロトタイプを複製し、要素固有の値を埋めた auto_handled エントリを返す。"""
+    entry = proto.copy()
+    entry["element"] = el
+    entry["selector"] = selector
+    entry["tag_name"] = info.get("tag_name", "input") or "input"
+    entry["type"] = info.get("type", default_type) or default_type
+    entry["name"] = info.get("name", "")
+    entry["id"] = info.get("id", "")
+    entry["required"] = required
+    if extra:
+        entry.update(extra)
+    return entry
+
+
+def _unique_elements(elements: List[Locator]) -> List[Locator]:
+    """同一 Locator オブジェクトの重複を除いた一覧（出現順を維持）。"""
+    seen: set = set()
+    unique: List[Locator] = []
+    for el in elements:
+        key = id(el)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(el)
+    return unique
+
+
+def _attr_blob_lc(info: Dict[str, Any]) -> str:
+    """name/id/class/placeholder の小文字連結（info 上にメモ化して各ハンドラで共有）。"""
+    blob = info.get("_blob_lc")
+    if blob is None:
+        blob = " ".join(
+            [
+                info.get("name", "") or "",
+                info.get("id", "") or "",
+                info.get("class", "") or "",
+                info.get("placeholder", "") or "",
+            ]
+        ).lower()
+        info["_blob_lc"] = blob
+    return blob
+
+
+def _name_id_class_lc(info: Dict[str, Any]) -> str:
+    """name/id/class の小文字連結（info 上にメモ化して各ハンドラで共有）。"""
+    blob = info.get("_nic_lc")
+    if blob is None:
+        blob = " ".join(
+            [info.get("name", ""), info.get("id", ""), info.get("class", "")]
+        ).lower()
+        info["_nic_lc"] = blob
+    return blob
+
+
+# 読み取り専用パスの `x or {}` 用共有空 dict（毎回の {} 生成を避ける。変更禁止）
+_EMPTY: Dict[str, Any] = {}
+
+# 昇格時に field_mapping へ持ち込まない auto_handled 専用キー
+_PROMOTE_SKIP_KEYS = frozenset(("auto_action", "default_value"))
+
+# 昇格対象となる auto_handled キーの接頭辞（生成側・昇格側で共有）
+_FULLNAME_PREFIX = "auto_fullname"
+_KANA_PREFIX = "auto_unified_kana_"
+_EMAIL_CONFIRM_PREFIX = "auto_email_confirm_"
+
+
+def _keys_with_prefix(mapping: Dict[str, Any], prefix: str) -> List[str]:
+    """接頭辞に一致するキー（挿入順）。走査中の追加/削除に備えてリストで返す。"""
+    return [k for k in mapping if k.startswith(prefix)]
+
+
+# FormStructure 上にキャッシュする「セレクタ→論理順インデックス」の属性名
+_SELECTOR_INDEX_ATTR = "_unmapped_selector_index"
+
+
+def _get_selector_sequence(
+    form_structure: FormStructure,
+) -> Tuple[List[Any], Dict[str, int]]:
+    """セレクタを持つ要素の論理順リストと、セレクタ→インデックスの辞書を返す。
+
+    同一 FormStructure に対する再計算を避けるため、elements の同一性/件数を
+    キーとして form_structure 自体にキャッシュする。
+    """
+    elements = form_structure.elements or []
+    cached = getattr(form_structure, _SELECTOR_INDEX_ATTR, None)
+    if cached is not None and cached[0] is elements and cached[1] == len(elements):
+        return cached[2], cached[3]
+    seq = [fe for fe in elements if getattr(fe, "selector", "")]
+    sel_to_idx: Dict[str, int] = {}
+    for i, fe in enumerate(seq):
+        # 重複セレクタは先頭を優先（従来の next(...) と同じ）
+        sel_to_idx.setdefault(fe.selector, i)
+    try:
+        setattr(form_structure, _SELECTOR_INDEX_ATTR, (elements, len(elements), seq, sel_to_idx))
+    except Exception:
+        pass
+    return seq, sel_to_idx
+
 
 class UnmappedElementHandler:
     """未マッピング要素の自動処理を担当するクラス"""
@@ -23,7 +202,7 @@ class UnmappedElementHandler:
         field_combination_manager: FieldCombinationManager,
         settings: Dict[str, Any],
         generate_playwright_selector_func: Callable[[Locator], Awaitable[str]],
-        get_element_details_func: Callable[[Locator], Awaitable[Dict[str, Any]]],
+        get_element_details_func: Callable[..., Awaitable[Dict[str, Any]]],
         field_patterns,
     ):
         self.page = page
@@ -36,9 +215,15 @@ class UnmappedElementHandler:
         self.field_patterns = field_patterns
         # 近傍コンテナの必須検出結果キャッシュ
         self._container_required_cache: Dict[str, bool] = {}
+        # handle_unmapped_elements 1パス内の要素情報キャッシュ（id(el) -> (el, info)）。
+        # 直後の昇格処理でも要素詳細の hint として使うため、次パス開始時まで保持する
+        self._info_cache: Dict[int, Tuple[Locator, Dict[str, Any]]] = {}
+        # 要素詳細/必須判定のキャッシュ（id(el) -> (el, 値)）。昇格処理での同一要素の再判定を避ける
+        self._details_cache: Dict[int, Tuple[Locator, Dict[str, Any]]] = {}
+        self._required_cache: Dict[int, Tuple[Locator, bool]] = {}
 
         # 必須マーカー（『※』は注記用途が多く誤検出の原因になるため除外）
-        self.REQUIRED_MARKERS = [
+        self.REQUIRED_MARKERS = (
             "*",
             "必須",
             "Required",
@@ -48,7 +233,72 @@ class UnmappedElementHandler:
             "（必須）",
             "[必須]",
             "［必須］",
-        ]
+        )
+        # 統合氏名パターンは静的なため一度だけ集合化
+        self._unified_name_patterns_set = (
+            frozenset(field_patterns.get_unified_name_patterns())
+            if field_patterns is not None
+            else frozenset()
+        )
+
+        # 確認用メール判定のトークン走査器（pyahocorasick 未導入時は None）
+        self._ac_attr = build_automaton(_EMAIL_CONFIRM_ATTR_PATTERNS)
+        self._ac_ctx = build_automaton(_EMAIL_CONFIRM_CTX_TOKENS)
+        self._ac_blacklist = build_automaton(_EMAIL_CONFIRM_BLACKLIST)
+        self._ac_email = build_automaton(_EMAIL_TOKENS)
+        # 属性/文脈トークンの最短長。これ未満の属性連結は小文字化・走査を省略できる
+        self._min_attr_tok_len = min(
+            len(t)
+            for t in _EMAIL_CONFIRM_ATTR_PATTERNS
+            + _EMAIL_CONFIRM_CTX_TOKENS
+            + _EMAIL_CONFIRM_BLACKLIST
+        )
+
+    async def _get_info(self, el: Locator) -> Dict[str, Any]:
+        """_get_element_info のパス内キャッシュ版（複数ハンドラが同一要素を参照するため）。"""
+        cached = self._info_cache.get(id(el))
+        if cached is not None and cached[0] is el:
+            return cached[1]
+        info = await self.element_scorer._get_element_info(el)
+        self._info_cache[id(el)] = (el, info)
+        return info
+
+    async def _cached_details(
+        self, el: Locator, selector: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """_get_element_details のキャッシュ版（呼び出し側で変更されるため複製を返す）。
+
+        selector: 自動処理時に生成済みのセレクタ（あれば再生成を省略）
+        同一パスで取得済みの要素情報があれば hint として渡し、属性の再取得を省略する。
+        """
+        cached = self._details_cache.get(id(el))
+        if cached is not None and cached[0] is el:
+            return dict(cached[1])
+        info = self._info_cache.get(id(el))
+        hint = info[1] if info is not None and info[0] is el else None
+        details = await self._get_element_details(el, selector=selector, hint=hint)
+        self._details_cache[id(el)] = (el, details)
+        return dict(details)
+
+    async def _cached_required(self, el: Locator) -> bool:
+        """_detect_required_status のキャッシュ版。"""
+        cached = self._required_cache.get(id(el))
+        if cached is not None and cached[0] is el:
+            return cached[1]
+        required = await self.element_scorer._detect_required_status(el)
+        self._required_cache[id(el)] = (el, required)
+        return required
+
+    async def _gather_bounded(self, coros: Iterable[Awaitable[Any]]) -> List[Any]:
+        """要素単位の検査を同時実行数を制限して並行実行（結果は入力順）。"""
+        limit = max(1, int(self.settings.get("auto_handle_concurrency", 16)))
+        sem = asyncio.Semaphore(limit)
+
+        async def _run(coro: Awaitable[Any]) -> Any:
+            async with sem:
+                return await coro
+
+        return await asyncio.gather(*(_run(c) for c in coros))
 
     async def _detect_group_required_via_container(self, first_radio: Locator) -> bool:
         """見出しコンテナ側の必須マーカーを探索して判定（設定化・キャッシュ付）。"""
@@ -120,7 +370,10 @@ class UnmappedElementHandler:
         if not self.settings.get("enable_auto_handling", True):
             return {}
 
-        auto_handled = {}
+        auto_handled: Dict[str, Dict[str, Any]] = {}
+        self._info_cache = {}
+        self._details_cache = {}
+        self._required_cache = {}
 
         # 先に『統合氏名/統合氏名カナ』が name1/name2 / kana1/kana2 のような分割ペアに誤割当てされていないかを確認し、
         # 該当する場合は統合マッピングを降格して分割入力を優先できるようにする（汎用・安全）。
@@ -231,16 +484,10 @@ class UnmappedElementHandler:
                 try:
                     if id(el) in mapped_element_ids:
                         continue
-                    info = await self.element_scorer._get_element_info(el)
+                    info = await self._get_info(el)
                     if not info.get("visible", True):
                         continue
-                    name_id_cls = " ".join(
-                        [
-                            info.get("name", ""),
-                            info.get("id", ""),
-                            info.get("class", ""),
-                        ]
-                    ).lower()
+                    name_id_cls = _name_id_class_lc(info)
                     nm = (info.get("name", "") or "").lower()
                     if nm in ("kana1", "kana_1", "kana2", "kana_2"):
                         # どちらか一方でも見つかれば候補
@@ -568,7 +815,7 @@ class UnmappedElementHandler:
 
             pairs = {}
             for el in text_inputs:
-                info = self.element_scorer._shared_cache.get(str(el)) or {}
+                info = self.element_scorer._shared_cache.get(str(el)) or _EMPTY
                 nm = _name_key(info.get("name", ""))
                 if not nm:
                     continue
@@ -577,12 +824,12 @@ class UnmappedElementHandler:
                 elif nm in ("name2", "name_2"):
                     pairs[2] = el
             if 1 in pairs and 2 in pairs:
-                mapped_name_attr = (field_mapping.get("統合氏名", {}) or {}).get(
+                mapped_name_attr = (field_mapping.get("統合氏名") or _EMPTY).get(
                     "name", ""
                 )
                 # 片方の name 属性が統合氏名の割当先と一致していれば降格
                 for idx in (1, 2):
-                    info = self.element_scorer._shared_cache.get(str(pairs[idx])) or {}
+                    info = self.element_scorer._shared_cache.get(str(pairs[idx])) or _EMPTY
                     if mapped_name_attr and mapped_name_attr == (
                         info.get("name", "") or ""
                     ):
@@ -610,7 +857,7 @@ class UnmappedElementHandler:
 
             pairs = {}
             for el in text_inputs:
-                info = self.element_scorer._shared_cache.get(str(el)) or {}
+                info = self.element_scorer._shared_cache.get(str(el)) or _EMPTY
                 nm = _name_key(info.get("name", ""))
                 if not nm:
                     continue
@@ -619,11 +866,11 @@ class UnmappedElementHandler:
                 elif nm in ("kana2", "kana_2"):
                     pairs[2] = el
             if 1 in pairs and 2 in pairs:
-                mapped_name_attr = (field_mapping.get("統合氏名カナ", {}) or {}).get(
+                mapped_name_attr = (field_mapping.get("統合氏名カナ") or _EMPTY).get(
                     "name", ""
                 )
                 for idx in (1, 2):
-                    info = self.element_scorer._shared_cache.get(str(pairs[idx])) or {}
+                    info = self.element_scorer._shared_cache.get(str(pairs[idx])) or _EMPTY
                     if mapped_name_attr and mapped_name_attr == (
                         info.get("name", "") or ""
                     ):
@@ -936,7 +1183,7 @@ class UnmappedElementHandler:
                     ]
                     if any(b in name_id_cls for b in blacklist):
                         continue
-                    if input_type in ["checkbox", "radio"] or tag == "select":
+                    if input_type in ("checkbox", "radio") or tag == "select":
                         continue
                 except Exception:
                     pass
@@ -1137,7 +1384,7 @@ class UnmappedElementHandler:
                 if not info.get("visible", True):
                     continue
                 t = (info.get("type", "") or "").lower()
-                if t not in ["", "text"]:
+                if t not in ("", "text"):
                     continue
                 blob = " ".join(
                     [
@@ -2120,6 +2367,25 @@ class UnmappedElementHandler:
                 return i
         return 0
 
+    def _classify_email_confirm(
+        self,
+        blob_lc: str,
+        best_lc: str,
+        nm_lc: str,
+        id_lc: str,
+        *,
+        name_variants: Any,
+        id_variants: Any,
+    ) -> Tuple[bool, bool, bool]:
+        """確認用メール欄の指標を (属性, 文脈, 主メールname/idのバリアント) で返す。
+
+        入力はすべて小文字化済みであること。空文字は走査しない。
+        """
+        attr_hit = contains_any(self._ac_attr, _EMAIL_CONFIRM_ATTR_PATTERNS, blob_lc)
+        ctx_hit = contains_any(self._ac_ctx, _EMAIL_CONFIRM_CTX_TOKENS, best_lc)
+        variant_hit = nm_lc in name_variants or id_lc in id_variants
+        return attr_hit, ctx_hit, variant_hit
+
     async def _auto_handle_email_confirmation(
         self,
         candidates: List[Locator],
@@ -2128,90 +2394,64 @@ class UnmappedElementHandler:
         form_structure: Optional[FormStructure] = None,
     ) -> Dict[str, Dict[str, Any]]:
         handled: Dict[str, Dict[str, Any]] = {}
-        if "メールアドレス" not in field_mapping:
+        # 本呼び出し中は不変のスナップショットで判定（並行検査中に元集合が変化しても影響を受けない）
+        mapped_ids = frozenset(mapped_element_ids)
+        # 主メール欄（セレクタ付き）が未確定なら確認欄のコピー元が無いため、候補走査自体を省略
+        if not (field_mapping.get("メールアドレス") or _EMPTY).get("selector"):
             return handled
-        confirmation_attr_patterns = [
-            "email_confirm",
-            "mail_confirm",
-            "email_confirmation",
-            "confirm_email",
-            "confirm_mail",
-            "mail2",
-            "mail_2",
-            "email2",
-            "email_2",
-            "confirm-mail",
-            "email-confirm",
-            "from2",
-            "email_check",
-            "mail_check",
-            "re_email",
-            "re_mail",
-        ]
-        confirmation_ctx_tokens = ["確認", "確認用", "再入力", "再度", "もう一度"]
-        blacklist = [
-            "captcha",
-            "image_auth",
-            "spam-block",
-            "token",
-            "otp",
-            "verification",
-        ]
-
+        # email_inputs + text_inputs の連結で同一要素が重複し得るため除去
+        candidates = _unique_elements(candidates)
         # 既に確定している主メール欄（論理フィールド『メールアドレス』）の name/id を取得して、
         # そのバリアント（例: "_<name>", "<name>2"）を確認欄として扱う汎用ヒューリスティクスを追加。
         primary_name = ""
         primary_id = ""
         try:
-            primary_info = field_mapping.get("メールアドレス", {}) or {}
+            primary_info = field_mapping.get("メールアドレス") or _EMPTY
             primary_name = (primary_info.get("name") or "").strip().lower()
             primary_id = (primary_info.get("id") or "").strip().lower()
         except Exception:
             primary_name = ""
             primary_id = ""
-        for i, el in enumerate(candidates):
-            if id(el) in mapped_element_ids:
-                continue
-            info = await self.element_scorer._get_element_info(el)
+        name_variants = (
+            {f"_{primary_name}", f"{primary_name}2", f"{primary_name}_confirm"}
+            if primary_name
+            else frozenset()
+        )
+        id_variants = (
+            {f"_{primary_id}", f"{primary_id}2", f"{primary_id}_confirm"}
+            if primary_id
+            else frozenset()
+        )
+
+        async def _inspect(i: int, el: Locator) -> Optional[Tuple[str, Dict[str, Any]]]:
+            info = await self._get_info(el)
             if not info.get("visible", True):
-                continue
+                return None
             name_raw = (info.get("name", "") or "").strip()
             id_raw = (info.get("id", "") or "").strip()
             placeholder_raw = (info.get("placeholder", "") or "").strip()
-            name_id_class = " ".join(
-                [name_raw, id_raw, info.get("class", ""), placeholder_raw]
-            ).lower()
-            if any(b in name_id_class for b in blacklist):
-                continue
-            attr_hit = any(p in name_id_class for p in confirmation_attr_patterns)
-            # プレースホルダに『確認』『再入力』等が含まれる場合も確認欄とみなす
-            if not attr_hit and placeholder_raw:
-                low_pl = placeholder_raw.lower()
-                if any(t.lower() in low_pl for t in confirmation_ctx_tokens):
-                    attr_hit = True
-
-            # バリアント規則:
-            # - 主メール name/id に対して、"_<name>" or "<name>2" や "<id>2" を確認欄とみなす
+            class_raw = info.get("class", "") or ""
+            blob_lc = ""
+            # 属性が最短トークン長に満たない場合は一致し得ないため、走査を省略して文脈判定へ
+            if (
+                len(name_raw) + len(id_raw) + len(class_raw) + len(placeholder_raw)
+                >= self._min_attr_tok_len
+            ):
+                blob_lc = _attr_blob_lc(info)
+                if contains_any(self._ac_blacklist, _EMAIL_CONFIRM_BLACKLIST, blob_lc):
+                    return None
+            # 属性 / プレースホルダ（『確認』『再入力』等）/ バリアント規則のいずれかで確認欄とみなす
+            # バリアント規則: 主メール name/id に対して "_<name>", "<name>2", "<name>_confirm"
             #   （例: F2M_FROM → _F2M_FROM, email → email2）
-            try:
-                nm = (name_raw or "").lower()
-                ide = (id_raw or "").lower()
-                if primary_name:
-                    if (
-                        nm == f"_{primary_name}"
-                        or nm == f"{primary_name}2"
-                        or nm == f"{primary_name}_confirm"
-                    ):
-                        attr_hit = True
-                if not attr_hit and primary_id:
-                    if (
-                        ide == f"_{primary_id}"
-                        or ide == f"{primary_id}2"
-                        or ide == f"{primary_id}_confirm"
-                    ):
-                        attr_hit = True
-            except Exception:
-                pass
+            confirm_attr, placeholder_hit, variant_hit = self._classify_email_confirm(
+                blob_lc,
+                placeholder_raw.lower(),
+                name_raw.lower(),
+                id_raw.lower(),
+                name_variants=name_variants,
+                id_variants=id_variants,
+            )
+            attr_hit = confirm_attr or placeholder_hit or variant_hit
             ctx_hit = False
             if not attr_hit:
                 try:
@@ -2224,34 +2464,42 @@ class UnmappedElementHandler:
                         self.context_text_extractor.get_best_context_text(contexts)
                         or ""
                     ).lower()
-                    ctx_hit = any(
-                        tok in best
-                        for tok in [t.lower() for t in confirmation_ctx_tokens]
-                    )
+                    ctx_hit = self._classify_email_confirm(
+                        "",
+                        best,
+                        "",
+                        "",
+                        name_variants=name_variants,
+                        id_variants=id_variants,
+                    )[1]
                 except Exception:
                     ctx_hit = False
             if not (attr_hit or ctx_hit):
-                continue
+                return None
             selector = await self._generate_playwright_selector(el)
-            required = await self.element_scorer._detect_required_status(el)
+            required = await self._cached_required(el)
             # コンテキスト/属性で確認欄と判断できた場合は、実入力上の必須が検出できなくても
             # 実用上の必須に準じて扱う（未入力だと送信拒否されるサイトが多いため）。
             required = bool(required or ctx_hit or attr_hit)
-            field_name = f"auto_email_confirm_{i+1}"
-            handled[field_name] = {
-                "element": el,
-                "selector": selector,
-                "tag_name": info.get("tag_name", "input") or "input",
-                "type": info.get("type", "email") or "email",
-                "name": info.get("name", ""),
-                "id": info.get("id", ""),
-                "input_type": "email",
-                "auto_action": "copy_from",
-                "copy_from_field": "メールアドレス",
-                "default_value": "",
-                "required": required,
-                "auto_handled": True,
-            }
+            field_name = f"{_EMAIL_CONFIRM_PREFIX}{i+1}"
+            return field_name, _make_handled_entry(
+                _ENTRY_PROTO_EMAIL,
+                el,
+                selector,
+                info,
+                default_type="email",
+                required=required,
+            )
+
+        # 割当済み要素はタスク生成前に除外（await を伴う検査を起動しない）
+        pending = [
+            (i, el) for i, el in enumerate(candidates) if id(el) not in mapped_ids
+        ]
+        for result in await self._gather_bounded(
+            _inspect(i, el) for i, el in pending
+        ):
+            if result is not None:
+                handled[result[0]] = result[1]
 
         # フォールバック: 上記ロジックで検出できなかった場合、
         # 『メール』系の文脈/属性を持つ入力が2つ以上存在し、
@@ -2259,12 +2507,12 @@ class UnmappedElementHandler:
         # もう一方を確認欄としてコピー入力対象にする（Google Forms 等の匿名構造対策）。
         try:
             if not handled:
-                primary_sel = (field_mapping.get("メールアドレス", {}) or {}).get("selector", "")
-                email_like: list[tuple] = []  # (el, info, best_ctx, sel)
+                primary_sel = (field_mapping.get("メールアドレス") or _EMPTY).get("selector", "")
+                chosen: Optional[tuple] = None  # (el, info, best_ctx, sel, attr_decided)
                 for el in candidates:
-                    if id(el) in mapped_element_ids:
+                    if id(el) in mapped_ids:
                         continue
-                    info = await self.element_scorer._get_element_info(el)
+                    info = await self._get_info(el)
                     if not info.get("visible", True):
                         continue
                     etype = (info.get("type", "") or "").lower()
@@ -2273,56 +2521,69 @@ class UnmappedElementHandler:
                         continue
                     nm = (info.get("name", "") or "").lower()
                     ide = (info.get("id", "") or "").lower()
-                    cls = (info.get("class", "") or "").lower()
-                    ph = (info.get("placeholder", "") or "").lower()
-                    attrs_blob = " ".join([nm, ide, cls, ph])
-                    contexts = await self.context_text_extractor.extract_context_for_element(el)
-                    best = (self.context_text_extractor.get_best_context_text(contexts) or "").lower()
-                    email_tokens = ["email", "e-mail", "mail", "メール"]
+                    attrs_len = (
+                        len(nm)
+                        + len(ide)
+                        + len(info.get("class", "") or "")
+                        + len(info.get("placeholder", "") or "")
+                    )
+                    attrs_blob = (
+                        _attr_blob_lc(info)
+                        if attrs_len >= self._min_attr_tok_len
+                        else ""
+                    )
+                    email_attr = (etype == "email") or contains_any(
+                        self._ac_email, _EMAIL_TOKENS, attrs_blob
+                    )
+                    confirm_attr, _, variant_hit = self._classify_email_confirm(
+                        attrs_blob,
+                        "",
+                        nm,
+                        ide,
+                        name_variants=name_variants,
+                        id_variants=id_variants,
+                    )
+                    # 属性だけで『メール系 + 確認系』が確定する場合は文脈抽出（CDP往復）を省略
+                    best = ""
+                    confirm_ctx = False
+                    if not (email_attr and (confirm_attr or variant_hit)):
+                        contexts = await self.context_text_extractor.extract_context_for_element(el)
+                        best = (self.context_text_extractor.get_best_context_text(contexts) or "").lower()
+                        _, confirm_ctx, _ = self._classify_email_confirm(
+                            "",
+                            best,
+                            "",
+                            "",
+                            name_variants=name_variants,
+                            id_variants=id_variants,
+                        )
                     # 1) メール系の指標
-                    email_hit = (etype == "email") or any(t in attrs_blob for t in email_tokens) or any(
-                        t in best for t in email_tokens
+                    email_hit = email_attr or contains_any(
+                        self._ac_email, _EMAIL_TOKENS, best
                     )
                     if not email_hit:
                         continue
                     # 2) 確認系の指標（属性 or コンテキスト or 主メール名/IDのバリアント）
-                    confirm_attr = any(p in attrs_blob for p in confirmation_attr_patterns)
-                    confirm_ctx = any(t.lower() in best for t in [c.lower() for c in confirmation_ctx_tokens])
-                    variant_hit = False
-                    try:
-                        if primary_name:
-                            if nm in {f"_{primary_name}", f"{primary_name}2", f"{primary_name}_confirm"}:
-                                variant_hit = True
-                        if primary_id and not variant_hit:
-                            if ide in {f"_{primary_id}", f"{primary_id}2", f"{primary_id}_confirm"}:
-                                variant_hit = True
-                    except Exception:
-                        variant_hit = False
                     if not (confirm_attr or confirm_ctx or variant_hit):
                         continue
                     sel = await self._generate_playwright_selector(el)
                     # 既に主メールと同一セレクタは除外
                     if primary_sel and sel == primary_sel:
                         continue
-                    email_like.append((el, info, best, sel))
-                if email_like:
                     # 最初の適合候補のみ採用
-                    el, info, best, sel = email_like[0]
-                    required = await self.element_scorer._detect_required_status(el)
-                    handled["auto_email_confirm_1"] = {
-                        "element": el,
-                        "selector": sel,
-                        "tag_name": info.get("tag_name", "input") or "input",
-                        "type": info.get("type", "email") or "email",
-                        "name": info.get("name", ""),
-                        "id": info.get("id", ""),
-                        "input_type": "email",
-                        "auto_action": "copy_from",
-                        "copy_from_field": "メールアドレス",
-                        "default_value": "",
-                        "required": bool(required or best),
-                        "auto_handled": True,
-                    }
+                    chosen = (el, info, best, sel, confirm_attr or variant_hit)
+                    break
+                if chosen:
+                    el, info, best, sel, attr_decided = chosen
+                    required = await self._cached_required(el)
+                    handled[f"{_EMAIL_CONFIRM_PREFIX}1"] = _make_handled_entry(
+                        _ENTRY_PROTO_EMAIL,
+                        el,
+                        sel,
+                        info,
+                        default_type="email",
+                        required=bool(required or best or attr_decided),
+                    )
         except Exception:
             # フォールバックでの例外は抑制（他ロジックに影響させない）
             pass
@@ -2330,18 +2591,24 @@ class UnmappedElementHandler:
         # さらに失敗した場合の最終フォールバック（構造順ベース）
         try:
             if not handled and form_structure and getattr(form_structure, "elements", None):
-                primary_sel = (field_mapping.get("メールアドレス", {}) or {}).get("selector", "")
-                # フォーム内論理順の一覧を作成
-                seq = [(fe.selector, fe) for fe in (form_structure.elements or []) if getattr(fe, 'selector', '')]
-                idx = next((i for i,(sel,fe) in enumerate(seq) if sel == primary_sel), -1)
+                primary_sel = (field_mapping.get("メールアドレス") or _EMPTY).get("selector", "")
+                # フォーム内論理順の一覧（セレクタ索引付き）を取得
+                seq, sel_to_idx = _get_selector_sequence(form_structure)
+                idx = sel_to_idx.get(primary_sel, -1)
                 if idx >= 0:
+                    used_sels = {
+                        v.get('selector')
+                        for v in field_mapping.values()
+                        if isinstance(v, dict) and v.get('selector')
+                    }
                     for j in range(idx+1, min(idx+6, len(seq))):
-                        sel, fe = seq[j]
+                        fe = seq[j]
+                        sel = fe.selector
                         if fe.tag_name != 'input':
                             continue
                         if fe.element_type in ('checkbox','radio','number','tel','url','password'):
                             continue
-                        if any((isinstance(v,dict) and v.get('selector')==sel) for v in field_mapping.values()):
+                        if sel in used_sels:
                             continue
                         # メール指標 + 確認指標の双方が必要
                         attrs_blob = " ".join([
@@ -2352,27 +2619,20 @@ class UnmappedElementHandler:
                             (fe.label_text or '').lower(),
                             (fe.associated_text or '').lower(),
                         ])
-                        email_tokens = ["email","e-mail","mail","メール"]
-                        email_hit = (fe.element_type or '').lower() == 'email' or any(t in attrs_blob for t in email_tokens)
-                        confirm_hit = any(t in attrs_blob for t in [c.lower() for c in [
-                            "確認","確認用","再入力","もう一度","confirm","confirmation","re_email","re_mail","email2","mail2"
-                        ]])
+                        email_hit = (fe.element_type or '').lower() == 'email' or contains_any(
+                            self._ac_email, _EMAIL_TOKENS, attrs_blob
+                        )
+                        confirm_hit = _CONFIRM_STRUCT_RE.search(attrs_blob) is not None
                         if not (email_hit and confirm_hit):
                             continue
-                        handled['auto_email_confirm_structural'] = {
-                            'element': fe.locator,
-                            'selector': sel,
-                            'tag_name': 'input',
-                            'type': fe.element_type or 'text',
-                            'name': fe.name or '',
-                            'id': fe.id or '',
-                            'input_type': 'email',
-                            'auto_action': 'copy_from',
-                            'copy_from_field': 'メールアドレス',
-                            'default_value': '',
-                            'required': True,
-                            'auto_handled': True,
-                        }
+                        handled['auto_email_confirm_structural'] = _make_handled_entry(
+                            _ENTRY_PROTO_EMAIL,
+                            fe.locator,
+                            sel,
+                            {'type': fe.element_type, 'name': fe.name or '', 'id': fe.id or ''},
+                            default_type='text',
+                            required=True,
+                        )
                         break
         except Exception:
             pass
@@ -2394,9 +2654,8 @@ class UnmappedElementHandler:
         """
         promoted_keys: List[str] = []
         try:
-            for k, v in list(auto_handled.items()):
-                if not k.startswith("auto_email_confirm_"):
-                    continue
+            for k in _keys_with_prefix(auto_handled, _EMAIL_CONFIRM_PREFIX):
+                v = auto_handled[k]
                 if not isinstance(v, dict):
                     continue
                 # 既に同一セレクタが field_mapping に存在する場合は昇格不要
@@ -2421,6 +2680,7 @@ class UnmappedElementHandler:
         - 要素が不可視/同一要素に既に割当済みの場合はスキップ
         """
         handled: Dict[str, Dict[str, Any]] = {}
+        mapped_ids = frozenset(mapped_element_ids)
         try:
             pairs = {
                 "name": [("姓", 0), ("名", 1)],
@@ -2431,26 +2691,25 @@ class UnmappedElementHandler:
                 k: [] for k in pairs.keys()
             }  # base -> [(locator, info)] (順序用)
             for el in text_inputs:
-                if id(el) in mapped_element_ids:
+                if id(el) in mapped_ids:
                     continue
                 try:
-                    info = await self.element_scorer._get_element_info(el)
+                    info = await self._get_info(el)
                 except Exception:
                     continue
                 if not info.get("visible", True):
                     continue
-                nm = (info.get("name", "") or "").lower()
-                for base in pairs.keys():
-                    if nm.startswith(base + "[") and nm.endswith("]"):
-                        try:
-                            idx = int(nm[len(base) + 1 : -1])
-                        except Exception:
-                            continue
-                        if idx in (0, 1):
-                            buckets[base][idx] = (el, info)
-                    elif nm == base + "[]":
-                        # インデックス無しの配列は出現順で割当
-                        order_buckets[base].append((el, info))
+                m = _ARR_RE.match((info.get("name", "") or "").lower())
+                if not m:
+                    continue
+                base, idx_s = m.group(1), m.group(2)
+                if idx_s == "":
+                    # インデックス無しの配列は出現順で割当
+                    order_buckets[base].append((el, info))
+                else:
+                    idx = int(idx_s)
+                    if idx in (0, 1):
+                        buckets[base][idx] = (el, info)
             for base, mapping in buckets.items():
                 if 0 in mapping and 1 in mapping:
                     for field_name, idx in pairs[base]:
@@ -2461,41 +2720,33 @@ class UnmappedElementHandler:
                             pass
                         el, info = mapping[idx]
                         selector = await self._generate_playwright_selector(el)
-                        required = await self.element_scorer._detect_required_status(el)
-                        handled[field_name] = {
-                            "element": el,
-                            "selector": selector,
-                            "tag_name": info.get("tag_name", "input") or "input",
-                            "type": info.get("type", "text") or "text",
-                            "name": info.get("name", ""),
-                            "id": info.get("id", ""),
-                            "input_type": "text",
-                            "default_value": "",
-                            "required": required,
-                            "visible": info.get("visible", True),
-                            "enabled": info.get("enabled", True),
-                            "auto_handled": True,
-                        }
+                        required = await self._cached_required(el)
+                        handled[field_name] = _make_handled_entry(
+                            _ENTRY_PROTO_TEXT,
+                            el,
+                            selector,
+                            info,
+                            default_type="text",
+                            required=required,
+                            visible=info.get("visible", True),
+                            enabled=info.get("enabled", True),
+                        )
             # 順序割当（name[] / kana[]）
             for base, items in order_buckets.items():
                 if len(items) >= 2:
                     for (field_name, idx), (el, info) in zip(pairs[base], items[:2]):
                         selector = await self._generate_playwright_selector(el)
-                        required = await self.element_scorer._detect_required_status(el)
-                        handled[field_name] = {
-                            "element": el,
-                            "selector": selector,
-                            "tag_name": info.get("tag_name", "input") or "input",
-                            "type": info.get("type", "text") or "text",
-                            "name": info.get("name", ""),
-                            "id": info.get("id", ""),
-                            "input_type": "text",
-                            "default_value": "",
-                            "required": required,
-                            "visible": info.get("visible", True),
-                            "enabled": info.get("enabled", True),
-                            "auto_handled": True,
-                        }
+                        required = await self._cached_required(el)
+                        handled[field_name] = _make_handled_entry(
+                            _ENTRY_PROTO_TEXT,
+                            el,
+                            selector,
+                            info,
+                            default_type="text",
+                            required=required,
+                            visible=info.get("visible", True),
+                            enabled=info.get("enabled", True),
+                        )
         except Exception as e:
             logger.debug(f"split name arrays handler error: {e}")
         return handled
@@ -2504,12 +2755,13 @@ class UnmappedElementHandler:
         self, text_inputs: List[Locator], mapped_element_ids: set
     ) -> Dict[str, Dict[str, Any]]:
         handled: Dict[str, Dict[str, Any]] = {}
+        mapped_ids = frozenset(mapped_element_ids)
         try:
             cand = []
             for el in text_inputs:
-                if id(el) in mapped_element_ids:
+                if id(el) in mapped_ids:
                     continue
-                info = await self.element_scorer._get_element_info(el)
+                info = await self._get_info(el)
                 if not info.get("visible", True):
                     continue
                 nm = (info.get("name", "") or "").lower()
@@ -2545,21 +2797,17 @@ class UnmappedElementHandler:
                 if kind in handled:
                     continue
                 selector = await self._generate_playwright_selector(el)
-                required = await self.element_scorer._detect_required_status(el)
-                handled[kind] = {
-                    "element": el,
-                    "selector": selector,
-                    "tag_name": info.get("tag_name", "input") or "input",
-                    "type": info.get("type", "text") or "text",
-                    "name": info.get("name", ""),
-                    "id": info.get("id", ""),
-                    "input_type": "text",
-                    "default_value": "",
-                    "required": required,
-                    "visible": info.get("visible", True),
-                    "enabled": info.get("enabled", True),
-                    "auto_handled": True,
-                }
+                required = await self._cached_required(el)
+                handled[kind] = _make_handled_entry(
+                    _ENTRY_PROTO_TEXT,
+                    el,
+                    selector,
+                    info,
+                    default_type="text",
+                    required=required,
+                    visible=info.get("visible", True),
+                    enabled=info.get("enabled", True),
+                )
         except Exception as e:
             logger.debug(f"family/given name handler error: {e}")
         return handled
@@ -2572,17 +2820,18 @@ class UnmappedElementHandler:
         form_structure: Optional[FormStructure],
     ) -> Dict[str, Dict[str, Any]]:
         handled = {}
-        unified_patterns = set(self.field_patterns.get_unified_name_patterns())
+        mapped_ids = frozenset(mapped_element_ids)
+        unified_patterns = self._unified_name_patterns_set
         if form_structure and form_structure.elements:
             for i, fe in enumerate(form_structure.elements):
-                if id(fe.locator) in mapped_element_ids:
+                if id(fe.locator) in mapped_ids:
                     continue
                 label_text = (fe.label_text or "").lower()
                 placeholder_text = (fe.placeholder or "").lower()
                 if any(p in label_text for p in unified_patterns) or any(
                     p in placeholder_text for p in unified_patterns
                 ):
-                    info = await self.element_scorer._get_element_info(fe.locator)
+                    info = await self._get_info(fe.locator)
                     if not info.get("visible", True):
                         continue
                     # 追加ガード: email/確認系には統合氏名を適用しない
@@ -2598,7 +2847,7 @@ class UnmappedElementHandler:
                     ):
                         continue
                     selector = await self._generate_playwright_selector(fe.locator)
-                    required = await self.element_scorer._detect_required_status(
+                    required = await self._cached_required(
                         fe.locator
                     )
                     fullname = self.field_combination_manager.generate_combined_value(
@@ -2606,20 +2855,16 @@ class UnmappedElementHandler:
                     )
                     if not fullname:
                         continue
-                    field_name = f"auto_fullname_label_{i+1}"
-                    handled[field_name] = {
-                        "element": fe.locator,
-                        "selector": selector,
-                        "tag_name": info.get("tag_name", "input"),
-                        "type": info.get("type", "text") or "text",
-                        "name": info.get("name", ""),
-                        "id": info.get("id", ""),
-                        "input_type": "text",
-                        "auto_action": "fill",
-                        "default_value": fullname,
-                        "required": required,
-                        "auto_handled": True,
-                    }
+                    field_name = f"{_FULLNAME_PREFIX}_label_{i+1}"
+                    handled[field_name] = _make_handled_entry(
+                        _ENTRY_PROTO_FILL,
+                        fe.locator,
+                        selector,
+                        info,
+                        default_type="text",
+                        required=required,
+                        default_value=fullname,
+                    )
         return handled
 
     async def _auto_handle_unified_kana(
@@ -2629,17 +2874,24 @@ class UnmappedElementHandler:
         client_data: Optional[Dict[str, Any]],
         form_structure: Optional[FormStructure],
     ) -> Dict[str, Dict[str, Any]]:
+        """統合カナ入力欄（auto_unified_kana_*）を自動入力。
+
+        生成するエントリは必ず "element" キーを持つ（必須昇格は element 前提で要素詳細を取得する）。
+        """
         handled: Dict[str, Dict[str, Any]] = {}
-        try:
-            for i, el in enumerate(text_inputs):
-                if id(el) in mapped_element_ids:
-                    continue
-                info = await self.element_scorer._get_element_info(el)
+        mapped_ids = frozenset(mapped_element_ids)
+
+        async def _inspect(i: int, el: Locator) -> Optional[Tuple[str, Dict[str, Any]]]:
+            try:
+                info = await self._get_info(el)
                 if not info.get("visible", True):
-                    continue
-                name_id_cls = " ".join(
-                    [info.get("name", ""), info.get("id", ""), info.get("class", "")]
-                ).lower()
+                    return None
+                name_id_cls = _name_id_class_lc(info)
+                # CAPTCHAや認証は除外（属性のみで判定できるため文脈取得より先に行う）
+                if any(
+                    b in name_id_cls for b in ["captcha", "image_auth", "spam-block"]
+                ):
+                    return None
                 # 候補判定: name/id/classに kana/furigana/カナ 等、またはラベルに「フリガナ」
                 contexts = (
                     await self.context_text_extractor.extract_context_for_element(el)
@@ -2653,30 +2905,22 @@ class UnmappedElementHandler:
                     or ("ふりがな" in best)
                 )
                 if not is_kana_like:
-                    continue
-                # CAPTCHAや認証は除外
-                if any(
-                    b in name_id_cls for b in ["captcha", "image_auth", "spam-block"]
-                ):
-                    continue
+                    return None
 
                 # kana/hiragana の種別推定（簡易）
                 kana_type = (
                     "hiragana"
-                    if any(
-                        h in (best + " " + name_id_cls)
-                        for h in ["ひらがな", "hiragana"]
-                    )
+                    if _HIRAGANA_RE.search(best) or _HIRAGANA_RE.search(name_id_cls)
                     else "katakana"
                 )
                 value = self.field_combination_manager.generate_unified_kana_value(
                     kana_type, client_data or {}
                 )
                 if not value:
-                    continue
+                    return None
 
                 selector = await self._generate_playwright_selector(el)
-                required = await self.element_scorer._detect_required_status(el)
+                required = await self._cached_required(el)
                 if not required:
                     # コンテキスト内の必須マーカー（* や 必須）が近傍に存在する場合は必須扱い
                     try:
@@ -2690,20 +2934,31 @@ class UnmappedElementHandler:
                             required = True
                     except Exception:
                         pass
-                field_name = f"auto_unified_kana_{i+1}"
-                handled[field_name] = {
-                    "element": el,
-                    "selector": selector,
-                    "tag_name": info.get("tag_name", "input"),
-                    "type": info.get("type", "text") or "text",
-                    "name": info.get("name", ""),
-                    "id": info.get("id", ""),
-                    "input_type": "text",
-                    "auto_action": "fill",
-                    "default_value": value,
-                    "required": required,
-                    "auto_handled": True,
-                }
+                field_name = f"{_KANA_PREFIX}{i+1}"
+                return field_name, _make_handled_entry(
+                    _ENTRY_PROTO_FILL,
+                    el,
+                    selector,
+                    info,
+                    default_type="text",
+                    required=required,
+                    default_value=value,
+                )
+            except Exception as e:
+                logger.debug(f"Auto handle unified kana candidate skipped: {e}")
+            return None
+
+        try:
+            pending = [
+                (i, el)
+                for i, el in enumerate(_unique_elements(text_inputs))
+                if id(el) not in mapped_ids
+            ]
+            for result in await self._gather_bounded(
+                _inspect(i, el) for i, el in pending
+            ):
+                if result is not None:
+                    handled[result[0]] = result[1]
         except Exception as e:
             logger.debug(f"Auto handle unified kana failed: {e}")
         return handled
@@ -2720,6 +2975,7 @@ class UnmappedElementHandler:
         - 必須判定が False の場合に限り、電話番号を代用して入力
         """
         handled: Dict[str, Dict[str, Any]] = {}
+        mapped_ids = frozenset(mapped_element_ids)
         # 設定で明示的に有効化された場合のみ実行（デフォルト無効）
         if not bool(self.settings.get("enable_optional_fax_fill", False)):
             return handled
@@ -2736,42 +2992,39 @@ class UnmappedElementHandler:
             ).strip()
             if not phone:
                 return handled
-            for i, el in enumerate(text_inputs):
-                if id(el) in mapped_element_ids:
+            for i, el in enumerate(_unique_elements(text_inputs)):
+                if id(el) in mapped_ids:
                     continue
-                info = await self.element_scorer._get_element_info(el)
+                info = await self._get_info(el)
                 if not info.get("visible", True):
                     continue
-                name_id_cls = " ".join(
-                    [info.get("name", ""), info.get("id", ""), info.get("class", "")]
-                ).lower()
-                contexts = (
-                    await self.context_text_extractor.extract_context_for_element(el)
-                )
-                best = (
-                    self.context_text_extractor.get_best_context_text(contexts) or ""
-                ).lower()
-                if not (
-                    ("fax" in name_id_cls) or ("ファックス" in best) or ("fax" in best)
-                ):
-                    continue
+                name_id_cls = _name_id_class_lc(info)
+                # 属性で判定できない場合のみ文脈（ラベル等）を取得
+                if "fax" not in name_id_cls:
+                    contexts = (
+                        await self.context_text_extractor.extract_context_for_element(
+                            el
+                        )
+                    )
+                    best = (
+                        self.context_text_extractor.get_best_context_text(contexts)
+                        or ""
+                    ).lower()
+                    if not (("ファックス" in best) or ("fax" in best)):
+                        continue
                 # 必須でない場合のみ自動入力
-                if await self.element_scorer._detect_required_status(el):
+                if await self._cached_required(el):
                     continue
                 selector = await self._generate_playwright_selector(el)
-                handled[f"auto_fax_{i+1}"] = {
-                    "element": el,
-                    "selector": selector,
-                    "tag_name": info.get("tag_name", "input"),
-                    "type": info.get("type", "text") or "text",
-                    "name": info.get("name", ""),
-                    "id": info.get("id", ""),
-                    "input_type": "text",
-                    "auto_action": "fill",
-                    "default_value": phone,
-                    "required": False,
-                    "auto_handled": True,
-                }
+                handled[f"auto_fax_{i+1}"] = _make_handled_entry(
+                    _ENTRY_PROTO_FILL,
+                    el,
+                    selector,
+                    info,
+                    default_type="text",
+                    required=False,
+                    default_value=phone,
+                )
         except Exception as e:
             logger.debug(f"Auto handle fax failed: {e}")
         return handled
@@ -2789,37 +3042,50 @@ class UnmappedElementHandler:
         - かつ『セイ/姓/SEI』『メイ/名/MEI』の指標で last/first を分類
         """
         handled: Dict[str, Dict[str, Any]] = {}
+        mapped_ids = frozenset(mapped_element_ids)
+
+        async def _inspect(el: Locator) -> Optional[Tuple[bool, bool]]:
+            """(姓カナらしさ, 名カナらしさ) を返す。対象外は None。"""
+            info = await self._get_info(el)
+            if not info.get("visible", True):
+                return None
+            name_id_cls = _name_id_class_lc(info)
+            contexts = (
+                await self.context_text_extractor.extract_context_for_element(el)
+            )
+            best = (
+                self.context_text_extractor.get_best_context_text(contexts) or ""
+            ).lower()
+            kana_like = (
+                ("kana" in name_id_cls)
+                or ("furigana" in name_id_cls)
+                or ("katakana" in name_id_cls)
+                or ("カナ" in best)
+                or ("フリガナ" in best)
+                or ("ふりがな" in best)
+            )
+            if not kana_like:
+                return None
+            blob = best + " " + name_id_cls
+            return (
+                any(t in blob for t in ["sei", "姓", "セイ"]),
+                any(t in blob for t in ["mei", "名", "メイ"]),
+            )
+
         try:
             last_el, first_el = None, None
-            for el in text_inputs:
-                if id(el) in mapped_element_ids:
-                    continue
-                info = await self.element_scorer._get_element_info(el)
-                if not info.get("visible", True):
-                    continue
-                name_id_cls = " ".join(
-                    [info.get("name", ""), info.get("id", ""), info.get("class", "")]
-                ).lower()
-                contexts = (
-                    await self.context_text_extractor.extract_context_for_element(el)
-                )
-                best = (
-                    self.context_text_extractor.get_best_context_text(contexts) or ""
-                ).lower()
-                kana_like = (
-                    ("kana" in name_id_cls)
-                    or ("furigana" in name_id_cls)
-                    or ("katakana" in name_id_cls)
-                    or ("カナ" in best)
-                    or ("フリガナ" in best)
-                    or ("ふりがな" in best)
-                )
-                if not kana_like:
+            pending = [
+                el for el in _unique_elements(text_inputs) if id(el) not in mapped_ids
+            ]
+            results = await self._gather_bounded(_inspect(el) for el in pending)
+            # 出現順で最初に該当した要素を採用（逐次処理時と同じ）
+            for el, result in zip(pending, results):
+                if result is None:
                     continue
-                blob = best + " " + name_id_cls
-                if any(t in blob for t in ["sei", "姓", "セイ"]):
+                is_last, is_first = result
+                if is_last:
                     last_el = last_el or el
-                if any(t in blob for t in ["mei", "名", "メイ"]):
+                if is_first:
                     first_el = first_el or el
             if not (last_el and first_el):
                 return handled
@@ -2829,65 +3095,130 @@ class UnmappedElementHandler:
             )
             last_kana = client.get("last_name_kana", "")
             first_kana = client.get("first_name_kana", "")
-            if last_el and last_kana:
-                selector = await self._generate_playwright_selector(last_el)
-                handled["auto_split_kana_last"] = {
-                    "element": last_el,
-                    "selector": selector,
-                    "tag_name": "input",
-                    "type": "text",
-                    "input_type": "text",
-                    "auto_action": "fill",
-                    "default_value": last_kana,
-                    "required": await self.element_scorer._detect_required_status(
-                        last_el
-                    ),
-                }
-            if first_el and first_kana:
-                selector = await self._generate_playwright_selector(first_el)
-                handled["auto_split_kana_first"] = {
-                    "element": first_el,
+            targets = [
+                (key, el, value)
+                for key, el, value in (
+                    ("auto_split_kana_last", last_el, last_kana),
+                    ("auto_split_kana_first", first_el, first_kana),
+                )
+                if value
+            ]
+            if not targets:
+                return handled
+            # セレクタ生成と必須判定をまとめて発行（逐次の CDP 往復を1回の待機に集約）
+            probes = await asyncio.gather(
+                *(self._generate_playwright_selector(el) for _, el, _ in targets),
+                *(self._cached_required(el) for _, el, _ in targets),
+            )
+            selectors, requireds = probes[: len(targets)], probes[len(targets) :]
+            for (key, el, value), selector, required in zip(
+                targets, selectors, requireds
+            ):
+                handled[key] = {
+                    "element": el,
                     "selector": selector,
                     "tag_name": "input",
                     "type": "text",
                     "input_type": "text",
                     "auto_action": "fill",
-                    "default_value": first_kana,
-                    "required": await self.element_scorer._detect_required_status(
-                        first_el
-                    ),
+                    "default_value": value,
+                    "required": required,
                 }
         except Exception as e:
             logger.debug(f"Auto handle split kana failed: {e}")
         return handled
 
-    async def promote_required_fullname_to_mapping(
+    async def _find_promotion(
         self,
         auto_handled: Dict[str, Dict[str, Any]],
         field_mapping: Dict[str, Dict[str, Any]],
+        *,
+        prefix: str,
+        target: str,
+        skip_if: Callable[[Dict[str, Dict[str, Any]]], bool],
+        build: Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]],
+    ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """required=True の auto_handled[prefix*] から昇格エントリを構築（field_mapping は変更しない）。
+
+        対象は最初の必須候補のみ。要素欠落や取得失敗で構築できなければ None を返し、
+        無関係な後続欄を昇格させないよう次の候補へは進まない。
+        """
+        if skip_if(field_mapping):
+            return None
+        auto_handled = auto_handled or _EMPTY
+        for k in _keys_with_prefix(auto_handled, prefix):
+            v = auto_handled[k]
+            if not isinstance(v, dict) or not v.get("required"):
+                continue
+            try:
+                entry = await build(v)
+            except (PlaywrightError, asyncio.TimeoutError) as e:
+                logger.debug("Promote required %s skipped: %s", target, e)
+                return None
+            return None if entry is None else (k, entry)
+        return None
+
+    async def _promote_required(
+        self,
+        auto_handled: Dict[str, Dict[str, Any]],
+        field_mapping: Dict[str, Dict[str, Any]],
+        *,
+        target: str,
+        **spec: Any,
     ) -> List[str]:
-        promoted_keys: List[str] = []
-        if "統合氏名" in field_mapping:
-            return promoted_keys
-        candidates = [
-            (k, v)
-            for k, v in (auto_handled or {}).items()
-            if k.startswith("auto_fullname") and v.get("required")
-        ]
-        if not candidates:
-            return promoted_keys
-        key, info = candidates[0]
-        el = info.get("element")
+        """required=True の auto_handled[prefix*] を field_mapping[target] に昇格（共通処理）。
+
+        昇格したエントリの元キー（auto_*）を返す。呼び出し側で auto_handled から除去する。
+        """
+        found = await self._find_promotion(
+            auto_handled, field_mapping, target=target, **spec
+        )
+        if found is None:
+            return []
+        field_mapping[target] = found[1]
+        return [found[0]]
+
+    async def _build_promoted_fullname(
+        self, v: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        el = v.get("element")
         if not el:
-            return promoted_keys
-        try:
-            element_info = await self._get_element_details(el)
+            return None
+        element_info = await self._cached_details(el, v.get("selector"))
+        element_info["score"] = 100
+        return element_info
+
+    async def _build_promoted_kana(
+        self, v: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        el = v.get("element")
+        if el is None:
+            return None
+        # 要素詳細を取得してプレースホルダー/属性を含める
+        element_info = await self._cached_details(el, v.get("selector"))
+        # 要素そのものの必須判定を反映（文脈マーカー由来の必須扱いは持ち込まず誤必須を防止）。
+        # 自動処理時の判定結果がキャッシュ済みのため追加の CDP 往復は発生しない。
+        required = await self._cached_required(el)
+        # 入力値はここでは設定せず（assignerが安全に決定）
+        if not element_info.get("score"):
             element_info["score"] = 100
-            field_mapping["統合氏名"] = element_info
-            promoted_keys.append(key)
-        except Exception as e:
-            logger.debug(f"Promote required fullname failed: {e}")
-        return promoted_keys
+        # _cached_details は複製を返すため element_info はここで専有している。
+        # 新しい dict を組み直さずそのまま field_mapping 用エントリとして引き渡す
+        for kk in _PROMOTE_SKIP_KEYS:
+            element_info.pop(kk, None)
+        element_info["input_type"] = "text"
+        element_info["required"] = required
+        element_info["source"] = "promoted"
+        return element_info
+
+    async def promote_required_fullname_to_mapping(
+        self,
+        auto_handled: Dict[str, Dict[str, Any]],
+        field_mapping: Dict[str, Dict[str, Any]],
+    ) -> List[str]:
+        return await self._promote_required(
+            auto_handled, field_mapping, **self._fullname_promotion_spec()
+        )
 
     async def promote_required_kana_to_mapping(
         self,
@@ -2900,53 +3231,46 @@ class UnmappedElementHandler:
         - auto_handled に required=True の auto_unified_kana_* があれば、
           『統合氏名カナ』として field_mapping に追加
         """
+        return await self._promote_required(
+            auto_handled, field_mapping, **self._kana_promotion_spec()
+        )
+
+    def _fullname_promotion_spec(self) -> Dict[str, Any]:
+        return {
+            "prefix": _FULLNAME_PREFIX,
+            "target": "統合氏名",
+            "skip_if": lambda fm: "統合氏名" in fm,
+            "build": self._build_promoted_fullname,
+        }
+
+    def _kana_promotion_spec(self) -> Dict[str, Any]:
+        return {
+            "prefix": _KANA_PREFIX,
+            "target": "統合氏名カナ",
+            "skip_if": lambda fm: "統合氏名カナ" in fm
+            or ("姓カナ" in fm and "名カナ" in fm),
+            "build": self._build_promoted_kana,
+        }
+
+    async def promote_all_required(
+        self,
+        auto_handled: Dict[str, Dict[str, Any]],
+        field_mapping: Dict[str, Dict[str, Any]],
+    ) -> List[str]:
+        """必須の統合氏名/統合氏名カナをまとめて field_mapping に昇格。
+
+        両者は昇格先・スキップ条件が独立しているため、要素詳細/必須判定の取得を並行発行し、
+        field_mapping への反映は 統合氏名 → 統合氏名カナ の順で行う（逐次呼び出しと同じ結果）。
+        昇格した元キー（auto_*）を返す。
+        """
+        specs = (self._fullname_promotion_spec(), self._kana_promotion_spec())
+        results = await asyncio.gather(
+            *(self._find_promotion(auto_handled, field_mapping, **spec) for spec in specs)
+        )
         promoted: List[str] = []
-        if ("統合氏名カナ" in field_mapping) or (
-            ("姓カナ" in field_mapping) and ("名カナ" in field_mapping)
-        ):
-            return promoted
-        for k, v in auto_handled.items():
-            if not k.startswith("auto_unified_kana_"):
-                continue
-            if not v.get("required", False):
-                continue
-            # フィールド名を昇格
-            try:
-                el = v.get("element")
-                # 可能なら要素詳細を取得してプレースホルダー/属性を含める
-                element_info = (
-                    await self._get_element_details(el)
-                    if el
-                    else {
-                        **{
-                            kk: vv
-                            for kk, vv in v.items()
-                            if kk not in ["auto_action", "default_value"]
-                        }
-                    }
-                )
-                # 入力値はここでは設定せず（assignerが安全に決定）
-                element_info.update(
-                    {
-                        "score": element_info.get("score", 0) or 100,
-                    }
-                )
-                field_mapping["統合氏名カナ"] = {
-                    **{
-                        kk: vv
-                        for kk, vv in element_info.items()
-                        if kk not in ["auto_action", "default_value"]
-                    },
-                    "input_type": "text",
-                    # 実際の必須性を要素から再判定して反映（誤必須を防止）
-                    "required": (await self.element_scorer._detect_required_status(el))
-                    if el
-                    else bool(element_info.get("required")),
-                    "source": "promoted",
-                }
-                # 呼び出し側で auto_handled から除去できるよう、昇格元キー（auto_*）を返す
-                promoted.append(k)
-                break
-            except Exception:
+        for spec, found in zip(specs, results):
+            if found is None:
                 continue
+            field_mapping[spec["target"]] = found[1]
+            promoted.append(found[0])
         return promoted
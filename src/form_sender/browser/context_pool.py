@@ -0,0 +1,105 @@
+"""
+BrowserContext のプロセス内プール
+
+ステルス適用・初期化スクリプト注入済みのコンテキストを、フィンガープリント
+（UA/ロケール/ステルス有無/資源ブロック規則など）をキーとしてアイドル保持し再利用する。
+プールが空のときは呼び出し側のファクトリで新規作成する。
+"""
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+from playwright.async_api import Browser, BrowserContext
+
+logger = logging.getLogger(__name__)
+
+# キーごとに保持するアイドルコンテキストの上限（超過分は閉じる）
+DEFAULT_MAX_IDLE_PER_KEY = 2
+
+
+class ContextPool:
+    """フィンガープリント単位でアイドルな BrowserContext を保持する。"""
+
+    def __init__(self, max_idle_per_key: int = DEFAULT_MAX_IDLE_PER_KEY):
+        self.max_idle_per_key = max(0, int(max_idle_per_key))
+        self._idle: Dict[Hashable, Deque[BrowserContext]] = {}
+
+    async def acquire(
+        self,
+        browser: Browser,
+        key: Hashable,
+        factory: Callable[[], Awaitable[BrowserContext]],
+    ) -> Tuple[BrowserContext, bool]:
+        """コンテキストを取得する。戻り値は (context, 再利用したか)。
+
+        別ブラウザに属するもの・既に閉じられたものは破棄して次を試す。
+        """
+        idle = self._idle.get(key)
+        while idle:
+            ctx = idle.popleft()
+            if ctx.browser is not browser or not _is_alive(ctx):
+                await _close_quietly(ctx)
+                continue
+            return ctx, True
+        return await factory(), False
+
+    async def release(self, ctx: Optional[BrowserContext], key: Hashable) -> None:
+        """コンテキストをプールへ返却する（開いているページは閉じる）。上限超過時は閉じる。"""
+        if ctx is None:
+            return
+        if not _is_alive(ctx):
+            await _close_quietly(ctx)
+            return
+        idle = self._idle.setdefault(key, deque())
+        if any(c is ctx for c in idle):
+            return
+        if len(idle) >= self.max_idle_per_key:
+            await _close_quietly(ctx)
+            return
+        for p in list(ctx.pages):
+            try:
+                await p.close()
+            except Exception:
+                pass
+        idle.append(ctx)
+
+    async def clear(self, browser: Optional[Browser] = None) -> None:
+        """アイドルコンテキストを閉じて破棄する（browser 指定時はそのブラウザ分のみ）。"""
+        for key, idle in list(self._idle.items()):
+            keep: Deque[BrowserContext] = deque()
+            while idle:
+                ctx = idle.popleft()
+                if browser is not None and ctx.browser is not browser:
+                    keep.append(ctx)
+                    continue
+                await _close_quietly(ctx)
+            if keep:
+                self._idle[key] = keep
+            else:
+                self._idle.pop(key, None)
+
+
+def _is_alive(ctx: BrowserContext) -> bool:
+    try:
+        _ = ctx.pages
+        return True
+    except Exception:
+        return False
+
+
+async def _close_quietly(ctx: BrowserContext) -> None:
+    try:
+        await ctx.close()
+    except Exception as e:
+        logger.debug("Pooled context close failed (suppressed): %s", e)
+
+
+_POOL: Optional[ContextPool] = None
+
+
+def get_context_pool() -> ContextPool:
+    """プロセス共有の ContextPool を返す（初回呼び出し時に生成）。"""
+    global _POOL
+    if _POOL is None:
+        _POOL = ContextPool()
+    return _POOL
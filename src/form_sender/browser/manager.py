@@ -5,7 +5,8 @@ import asyncio
 import logging
 import os
 import platform
-from typing import Optional, Dict, Any, List
+import weakref
+from typing import Optional, Dict, Any, Tuple
 
 from playwright.async_api import (
     async_playwright,
@@ -13,13 +14,104 @@ from playwright.async_api import (
     Browser,
     BrowserContext,
     Page,
+    Error as PlaywrightError,
     TimeoutError as PlaywrightTimeoutError
 )
-from playwright_stealth import Stealth
 from form_sender.utils.cookie_blocker import install_cookie_routes, install_init_script, try_reject_banners
+from form_sender.browser.context_pool import get_context_pool
+
+# playwright-stealth の解決結果 (api, Stealth クラス, stealth_async 関数)。未解決は None
+_STEALTH_RESOLVED: Optional[Tuple[str, Any, Any]] = None
+
+
+def _resolve_stealth() -> Tuple[str, Any, Any]:
+    """playwright-stealth のバージョン差異（v2: Stealth / v1: stealth_async）を解決する。
+
+    ステルス有効時にのみ呼ばれ、import と判定はプロセスで一度だけ行う（無効時はモジュールを読み込まない）。
+    """
+    global _STEALTH_RESOLVED
+    if _STEALTH_RESOLVED is None:
+        try:
+            from playwright_stealth import Stealth as v2  # type: ignore
+        except Exception:
+            v2 = None
+        try:
+            from playwright_stealth import stealth_async as v1  # type: ignore
+        except Exception:
+            v1 = None
+        api = 'v2' if v2 is not None else ('v1' if v1 is not None else 'none')
+        _STEALTH_RESOLVED = (api, v2, v1)
+    return _STEALTH_RESOLVED
 
 logger = logging.getLogger(__name__)
 
+# 実行環境（プロセス中に変わらないため import 時に一度だけ判定）
+_IS_DARWIN = platform.system().lower() == 'darwin'
+_IS_GHA = os.getenv("GITHUB_ACTIONS") == "true"
+
+# macOS GUI 以外で使用する UA（コンテキストの UA とリクエストヘッダで共通）
+_WIN_CHROME_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# 起動時のブラウザ引数（launch() ごとの再構築を避けるため事前構築）
+_ARGS_LINUX: Tuple[str, ...] = (
+    "--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage",
+    "--disable-software-rasterizer", "--disable-web-security",
+    "--disable-extensions", "--disable-plugins", "--disable-images", "--no-first-run",
+    "--disable-background-timer-throttling", "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows", "--disable-ipc-flooding-protection",
+    "--disable-features=VizDisplayCompositor", "--disable-background-networking",
+)
+_ARGS_GHA: Tuple[str, ...] = _ARGS_LINUX + (
+    "--memory-pressure-off", "--max_old_space_size=2048",
+    "--disable-sync", "--disable-translate",
+    "--force-color-profile=srgb", "--disable-accelerated-2d-canvas",
+    "--disable-accelerated-jpeg-decoding", "--disable-accelerated-mjpeg-decode",
+    "--disable-accelerated-video-decode", "--disable-threaded-animation",
+    "--disable-threaded-scrolling",
+)
+_ARGS_DARWIN_LOCAL: Tuple[str, ...] = ()
+
+# ターゲット/接続クローズ系の一過性エラー（型で判定）。
+# TargetClosedError は playwright>=1.41 のみ提供のため、未提供時はメッセージ照合へフォールバックする
+try:
+    from playwright._impl._errors import TargetClosedError as _TargetClosedError  # type: ignore
+except ImportError:
+    _TargetClosedError = None
+_TRANSIENT_ERRORS: Tuple[type, ...] = (ConnectionError,) + (
+    (_TargetClosedError,) if _TargetClosedError is not None else ()
+)
+_TRANSIENT_MARKERS: Tuple[str, ...] = ("Target page", "Connection closed", "Target closed")
+# 終了処理で「既に閉じられている」とみなすメッセージ（Playwright の汎用 Error のみ照合）
+_ALREADY_CLOSED_MARKERS: Tuple[str, ...] = ("Connection closed", "Target closed", "invalid state")
+
+
+def _is_transient_error(e: BaseException) -> bool:
+    """ページ作成時に一度だけ再試行すべきターゲット/接続クローズ系エラーか。"""
+    if isinstance(e, _TRANSIENT_ERRORS):
+        return True
+    if _TargetClosedError is None and isinstance(e, PlaywrightError):
+        msg = e.message or ""
+        return any(k in msg for k in _TRANSIENT_MARKERS)
+    return False
+
+
+def _is_already_closed_error(e: BaseException) -> bool:
+    """close() 時の例外が「既に閉じられている」ことを示すか。"""
+    if isinstance(e, _TRANSIENT_ERRORS):
+        return True
+    if isinstance(e, PlaywrightError):
+        msg = e.message or ""
+        return any(k in msg for k in _ALREADY_CLOSED_MARKERS)
+    return False
+
+
+# 問い合わせフォームの入力準備ができたとみなす要素（networkidle 待機の打ち切り条件）
+_FORM_READY_SELECTOR = "form textarea, form input[type='email']"
+
 
 class BrowserManager:
     """Playwrightブラウザの起動、ページ作成、終了を管理する"""
@@ -32,8 +124,11 @@ class BrowserManager:
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
-        self._stealth: Optional[Stealth] = None
-        self._stealth_applied: bool = False
+        self._stealth: Optional[Any] = None  # v2 の Stealth インスタンス
+        # 現コンテキストへのステルス適用済みフラグ（wait はせず is_set/set/clear のみのためループに束縛されない）
+        self._stealth_applied = asyncio.Event()
+        # 適用中の試行（完了で set）。並行呼び出しはロックで順番待ちせず、この1回の完了を待つ
+        self._stealth_inflight: Optional[asyncio.Event] = None
         self._stealth_cm = None  # async context manager returned by Stealth().use_async(async_playwright())
         self._stealth_enabled: bool = True
         # playwright-stealth バージョン両対応用
@@ -42,6 +137,16 @@ class BrowserManager:
         # コンテキストのライフサイクル用ロック（遅延初期化: 実行中のイベントループに結びつける）
         self._context_lock = None
         self._context_lock_loop = None
+        # 共有ブラウザ（CDP接続）利用時は True。close() でブラウザ本体を終了しない
+        self._shared_browser: bool = False
+        # self.context の生存状態（close イベントで False。健全性検査の IPC プローブを不要にする）
+        self._context_alive: bool = False
+        # close ハンドラ登録済みのコンテキスト（プールから再取得した際の二重登録防止）
+        self._tracked_contexts: "weakref.WeakSet[BrowserContext]" = weakref.WeakSet()
+        # 準備済みコンテキストの再利用プール（プロセス共有）
+        self._pool = get_context_pool()
+        # launch() 直後にバックグラウンドでコンテキストを準備するタスク
+        self._prewarm_task: Optional[asyncio.Task] = None
 
         # 設定値
         # デフォルトはやや長め（初回読み込みの安定性重視）
@@ -54,6 +159,18 @@ class BrowserManager:
         self._rb_block_images = bool(rb_cfg.get("block_images", True))
         self._rb_block_fonts = bool(rb_cfg.get("block_fonts", True))
         self._rb_block_stylesheets = bool(rb_cfg.get("block_stylesheets", False))
+        # Cookie コントロール設定（ワーカー内で不変のため、ここで一度だけ解釈して保持）
+        cookie_cfg = browser_cfg.get("cookie_control", {}) if isinstance(browser_cfg, dict) else {}
+        self._cookie_cfg: Dict[str, Any] = cookie_cfg if isinstance(cookie_cfg, dict) else {}
+        self._cookie_route_opts: Dict[str, Any] = self._build_cookie_route_opts(self._cookie_cfg)
+        # 既定は無効（誤検出/互換性への影響を避ける）。設定で明示有効化時のみON。
+        self._cookie_override: bool = bool(self._cookie_cfg.get("override_document_cookie", False))
+        self._ui_reject_banners: bool = bool(self._cookie_cfg.get("ui_reject_banners", True))
+        # 共有ブラウザの CDP エンドポイント（設定優先、未指定なら環境変数）。空なら従来どおり個別起動
+        self._shared_cdp_endpoint: str = (
+            str(browser_cfg.get("shared_cdp_endpoint") or "").strip()
+            or os.getenv("PLAYWRIGHT_CDP_ENDPOINT", "").strip()
+        )
         # ステルス設定
         try:
             self._stealth_enabled = bool(stealth_cfg.get("enabled", True))
@@ -62,43 +179,71 @@ class BrowserManager:
         except Exception:
             self._stealth_enabled = True
             self._navigator_languages = ("ja-JP", "ja")
+        # コンテキスト作成引数（ワーカー内で不変のため事前構築）
+        # macOS GUI では UA をシステムChromeに委任（安定性優先）。それ以外は Windows Chrome の UA に固定
+        self._use_win_ua: bool = not (_IS_DARWIN and self.headless in (False, None))
+        # どの環境でもロケール/タイムゾーン/Accept-Language を固定（JST運用要件 + 自然な言語ヘッダ）
+        self._context_kwargs: Dict[str, Any] = {
+            "locale": "ja-JP",
+            "timezone_id": "Asia/Tokyo",
+            "extra_http_headers": {"Accept-Language": "ja, en-US;q=0.8, en;q=0.7"},
+            # フォーム入力に不要なレンダラ負荷を抑える（アニメーション抑制・ダウンロード無効）
+            "reduced_motion": "reduce",
+            "accept_downloads": False,
+            # Service Worker 経由のリクエストはコンテキストのルートを迂回するためブロック
+            "service_workers": "block",
+            "java_script_enabled": True,
+            "viewport": {"width": 1280, "height": 720},
+        }
+        if self._use_win_ua:
+            # UAはリクエストヘッダと整合させる（検出回避のため一致させる）
+            self._context_kwargs["user_agent"] = _WIN_CHROME_UA
+            self._context_kwargs["extra_http_headers"]["User-Agent"] = _WIN_CHROME_UA
+        # コンテキストプールのキー（上記の設定から決まり、以後変わらない）
+        self._pool_key: tuple = self._context_key()
 
     async def launch(self) -> bool:
         """Playwrightブラウザを初期化して起動する"""
         try:
-            logger.info(f"Worker {self.worker_id}: Initializing Playwright browser")
-            is_github_actions = os.getenv("GITHUB_ACTIONS") == "true"
-
-            # playwright-stealth のバージョン検出と起動
-            if self._stealth_enabled:
-                # v2（Stealth/use_async）優先、失敗したら v1（stealth_async）→ 最後にプレーン
+            logger.info("Worker %s: Initializing Playwright browser", self.worker_id)
+            is_github_actions = _IS_GHA
+
+            # playwright-stealth の起動（API はプロセスで一度だけ解決）
+            # v2（Stealth/use_async）優先、失敗したら v1（stealth_async）→ 最後にプレーン
+            pw: Optional[Playwright] = None
+            stealth_api, stealth_v2, stealth_v1 = (
+                _resolve_stealth() if self._stealth_enabled else ('none', None, None)
+            )
+            if stealth_api == 'v2':
                 try:
-                    from playwright_stealth import Stealth as _S  # type: ignore
-                    self._stealth = _S(
+                    self._stealth = stealth_v2(
                         navigator_languages_override=self._navigator_languages
                     )
                     self._stealth_cm = self._stealth.use_async(async_playwright())
-                    self.playwright = await self._stealth_cm.__aenter__()
+                    pw = await self._stealth_cm.__aenter__()
                     self._stealth_api = 'v2'
-                    logger.info(f"Worker {self.worker_id}: Playwright initialized with stealth v2 context manager")
+                    logger.info("Worker %s: Playwright initialized with stealth v2 context manager", self.worker_id)
                 except Exception as e_v2:
+                    self._stealth_cm = None
+                    self._stealth = None
+                    logger.warning("Worker %s: Stealth v2 initialization failed: %s", self.worker_id, e_v2)
+            if pw is None:
+                pw = await async_playwright().start()
+                if stealth_v1 is not None:
                     # v1: ページ単位で適用（後続で new_page 時に適用）
-                    try:
-                        from playwright_stealth import stealth_async as _stealth_async  # type: ignore
-                        self.playwright = await async_playwright().start()
-                        self._stealth_api = 'v1'
-                        self._stealth_async_func = _stealth_async
-                        logger.info(f"Worker {self.worker_id}: Playwright initialized with stealth v1 (page-level)")
-                    except Exception as e_v1:
-                        self._stealth_cm = None
-                        self._stealth = None
-                        self._stealth_api = 'none'
-                        self.playwright = await async_playwright().start()
-                        logger.warning(f"Worker {self.worker_id}: Stealth unavailable, using plain Playwright (v2 err: {e_v2}; v1 err: {e_v1})")
-            else:
-                self.playwright = await async_playwright().start()
-            if is_github_actions:
-                await asyncio.sleep(0.5)
+                    self._stealth_api = 'v1'
+                    self._stealth_async_func = stealth_v1
+                    logger.info("Worker %s: Playwright initialized with stealth v1 (page-level)", self.worker_id)
+                else:
+                    self._stealth_api = 'none'
+                    if self._stealth_enabled:
+                        logger.warning("Worker %s: Stealth unavailable, using plain Playwright", self.worker_id)
+            self.playwright = pw
+
+            # 共有ブラウザが指定されていれば接続のみ（ワーカーごとの Chromium 起動を省略）
+            if self._shared_cdp_endpoint and await self._connect_shared():
+                self._start_prewarm()
+                return True
 
             browser_args = self._get_browser_args(is_github_actions)
             launch_timeout = 60000 if is_github_actions else 30000
@@ -111,7 +256,7 @@ class BrowserManager:
                 use_headless_env if use_headless_env is not None else (self.headless if self.headless is not None else True)
             )
             mode_desc = "headless" if use_headless else "GUI"
-            logger.info(f"Worker {self.worker_id}: Using {mode_desc} mode")
+            logger.info("Worker %s: Using %s mode", self.worker_id, mode_desc)
 
             # slow_mo はデフォルト無効。必要時のみ環境変数で指定（ms）
             slow_env = os.getenv('PLAYWRIGHT_SLOW_MO_MS', '').strip()
@@ -120,7 +265,7 @@ class BrowserManager:
                 slow_kw = {"slow_mo": int(slow_env)}
 
             # macOS の GUI 実行ではシステムの Chrome を優先利用（安定化）
-            use_chrome_channel = (platform.system().lower() == 'darwin' and not use_headless and not is_github_actions)
+            use_chrome_channel = (_IS_DARWIN and not use_headless and not is_github_actions)
             launch_succeeded = False
             last_err: Optional[Exception] = None
 
@@ -133,10 +278,10 @@ class BrowserManager:
                         **slow_kw,
                     )
                     launch_succeeded = True
-                    logger.info(f"Worker {self.worker_id}: Launched system Chrome via channel")
+                    logger.info("Worker %s: Launched system Chrome via channel", self.worker_id)
                 except Exception as e:
                     last_err = e
-                    logger.warning(f"Worker {self.worker_id}: Failed to launch system Chrome, falling back to bundled Chromium: {e}")
+                    logger.warning("Worker %s: Failed to launch system Chrome, falling back to bundled Chromium: %s", self.worker_id, e)
 
             if not launch_succeeded:
                 # 既定: バンドルされた Chromium を利用
@@ -147,40 +292,95 @@ class BrowserManager:
                     **slow_kw,
                 )
 
-            # 環境に関わらず、起動直後は短い待機を入れて安定化
-            await asyncio.sleep(0.5 if not is_github_actions else 1.0)
+            # 起動直後はブラウザが応答するまで待って安定化（従来の固定待機と同じ上限で、応答し次第戻る）
+            await self._wait_browser_ready(1.0 if is_github_actions else 0.5)
 
-            logger.info(f"Worker {self.worker_id}: Browser initialized successfully")
+            logger.info("Worker %s: Browser initialized successfully", self.worker_id)
+            self._start_prewarm()
             return True
 
         except Exception as e:
-            logger.error(f"Worker {self.worker_id}: Browser initialization failed: {e}")
+            logger.error("Worker %s: Browser initialization failed: %s", self.worker_id, e)
             return False
 
-    def _get_browser_args(self, is_github_actions: bool) -> List[str]:
-        """起動時のブラウザ引数を取得する"""
+    async def _wait_browser_ready(self, deadline_s: float) -> None:
+        """ブラウザへ CDP の往復を1回発行し、応答を待つ（deadline_s 秒で打ち切り）。
+
+        is_connected()/contexts はクライアント側の状態を読むだけで応答確認にならないため、
+        ブラウザ CDP セッションの確立・切断で実際に往復できることを確かめる。失敗しても起動は継続する。
+        """
+        if self.browser is None:
+            return
+        try:
+            session = await asyncio.wait_for(self.browser.new_browser_cdp_session(), timeout=deadline_s)
+            await session.detach()
+        except Exception as e:
+            logger.debug("Worker %s: Browser readiness probe skipped: %s", self.worker_id, e)
+
+    def _start_prewarm(self) -> None:
+        """コンテキスト準備（作成/初期化スクリプト/ステルス）をバックグラウンドで開始する。"""
+        self._prewarm_task = asyncio.create_task(self._prewarm_context())
+
+    async def _prewarm_context(self) -> None:
+        """初回 create_new_page の前にコンテキストを用意しておく（失敗しても create_new_page で再作成）。
+
+        ロック下で実行するため、先行して呼ばれた create_new_page はこの完了を待ってから進む。
+        """
+        try:
+            _lock = self._ensure_context_lock()
+            if _lock is None:
+                return
+            async with _lock:
+                if self.context or not self.browser:
+                    return
+                await self._acquire_context()
+                await self._ensure_stealth(self.context)
+                logger.info("Worker %s: Browser context prewarmed", self.worker_id)
+        except Exception as e:
+            logger.debug("Worker %s: Context prewarm skipped: %s", self.worker_id, e)
+
+    def _build_cookie_route_opts(self, cookie_cfg: Dict[str, Any]) -> Dict[str, Any]:
+        """install_cookie_routes に渡す引数を構築（存在しない/不正な値は安全な既定にフォールバック）。"""
+        s_domains = cookie_cfg.get("strip_set_cookie_domains", [])
+        if not isinstance(s_domains, list):
+            logger.warning("cookie_control.strip_set_cookie_domains must be a list; using empty list")
+            s_domains = []
+        s_exclude = cookie_cfg.get("strip_set_cookie_exclude_domains", [])
+        if not isinstance(s_exclude, list):
+            logger.warning("cookie_control.strip_set_cookie_exclude_domains must be a list; using empty list")
+            s_exclude = []
+        return dict(
+            block_cmp_scripts=bool(cookie_cfg.get("block_cmp_scripts", True)),
+            strip_set_cookie=bool(cookie_cfg.get("strip_set_cookie", False)),
+            resource_block_rules={
+                "images": self._rb_block_images,
+                "fonts": self._rb_block_fonts,
+                "stylesheets": self._rb_block_stylesheets,
+            },
+            strip_set_cookie_third_party_only=bool(cookie_cfg.get("strip_set_cookie_third_party_only", True)),
+            strip_set_cookie_domains=tuple(s_domains),
+            strip_set_cookie_exclude_domains=tuple(s_exclude),
+        )
+
+    async def _connect_shared(self) -> bool:
+        """共有ブラウザへ CDP 接続する。失敗時は False（呼び出し側で個別起動にフォールバック）。"""
+        try:
+            self.browser = await self.playwright.chromium.connect_over_cdp(self._shared_cdp_endpoint)
+            self._shared_browser = True
+            logger.info("Worker %s: Connected to shared browser over CDP", self.worker_id)
+            return True
+        except Exception as e:
+            self.browser = None
+            self._shared_browser = False
+            logger.warning("Worker %s: Shared browser connection failed, launching own browser: %s", self.worker_id, e)
+            return False
+
+    def _get_browser_args(self, is_github_actions: bool) -> Tuple[str, ...]:
+        """起動時のブラウザ引数を取得する（環境ごとの事前構築済みタプルを返す）"""
         # ローカル（macOS等）では安定性を最優先し、ブラウザ引数は極力付けない
-        if not is_github_actions and platform.system().lower() == 'darwin':
-            return []
-
-        base_args = [
-            "--no-sandbox", "--disable-setuid-sandbox", "--disable-dev-shm-usage",
-            "--disable-software-rasterizer", "--disable-web-security",
-            "--disable-extensions", "--disable-plugins", "--disable-images", "--no-first-run",
-            "--disable-background-timer-throttling", "--disable-renderer-backgrounding",
-            "--disable-backgrounding-occluded-windows", "--disable-ipc-flooding-protection",
-            "--disable-features=VizDisplayCompositor", "--disable-background-networking",
-        ]
-        if is_github_actions:
-            base_args.extend([
-                "--memory-pressure-off", "--max_old_space_size=2048",
-                "--disable-sync", "--disable-translate", 
-                "--force-color-profile=srgb", "--disable-accelerated-2d-canvas",
-                "--disable-accelerated-jpeg-decoding", "--disable-accelerated-mjpeg-decode",
-                "--disable-accelerated-video-decode", "--disable-threaded-animation",
-                "--disable-threaded-scrolling",
-            ])
-        return base_args
+        if not is_github_actions and _IS_DARWIN:
+            return _ARGS_DARWIN_LOCAL
+        return _ARGS_GHA if is_github_actions else _ARGS_LINUX
 
     async def create_new_page(self, form_url: str) -> Page:
         """新しいブラウザコンテキストとページを作成し、指定URLにアクセスする"""
@@ -197,150 +397,68 @@ class BrowserManager:
         try:
             # 既存のコンテキストは極力再利用（GUI安定性優先）
             last_err: Optional[Exception] = None
-            page: Optional[Page] = None  # retryスコープ外で初期化して参照安全性を確保
+            # retryスコープ外で保持し、タイムアウト時は同じページで goto のみ再試行する
+            page: Optional[Page] = None
             for i in range(2):
-                page = None
+                if page is not None and page.is_closed():
+                    page = None
                 try:
-                    # 原子的な健全性チェック（並行競合を抑止）
-                    try:
-                        _lock = self._ensure_context_lock()
-                        if _lock is not None:
-                            async with _lock:
+                    # 健全性チェック。生存中（定常パス）はフラグ参照のみでロックを取らず、
+                    # 閉じられていた場合のみロック下で再確認して破棄する（二重チェック）
+                    if self.context is not None and not self._context_alive:
+                        try:
+                            _lock = self._ensure_context_lock()
+                            if _lock is not None:
+                                async with _lock:
+                                    await self._ensure_context_health()
+                            else:
                                 await self._ensure_context_health()
-                        else:
-                            await self._ensure_context_health()
-                    except Exception:
-                        # 健全性検査失敗は続行（下で再生成）
-                        pass
-                    # 二重の健全性チェックは不要（_ensure_context_health 内で実施済み）
+                        except Exception:
+                            # 健全性検査失敗は続行（下で再生成）
+                            pass
 
-                    # コンテキストが無い場合のみ作成
-                    context_created_here = False
+                    # コンテキストが無い場合のみ取得（プールの準備済みコンテキスト優先、無ければ新規作成）
                     if not self.context:
-                        # どの環境でもロケール/タイムゾーン/Accept-Language を固定（JST運用要件 + 自然な言語ヘッダ）
-                        context_common = dict(
-                            locale="ja-JP",
-                            timezone_id="Asia/Tokyo",
-                            extra_http_headers={
-                                "Accept-Language": "ja, en-US;q=0.8, en;q=0.7",
-                            },
-                        )
-                        # 作成はロック下で二重生成を回避
+                        # 作成はロック下で再確認して二重生成を回避（事前準備タスク実行中はその完了を待つ）
                         _lock = self._ensure_context_lock()
                         if _lock is not None:
                             async with _lock:
                                 if not self.context:
-                                    if platform.system().lower() == 'darwin' and (self.headless is False or self.headless is None):
-                                        self.context = await self.browser.new_context(**context_common)
-                                    else:
-                                        # UAはページヘッダと整合するフル文字列を利用（検出回避のため一致させる）
-                                        self.context = await self.browser.new_context(
-                                            user_agent=(
-                                                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                                                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                                                "Chrome/120.0.0.0 Safari/537.36"
-                                            ),
-                                            **context_common,
-                                        )
-                                    context_created_here = True
+                                    await self._acquire_context()
                         else:
-                            if platform.system().lower() == 'darwin' and (self.headless is False or self.headless is None):
-                                self.context = await self.browser.new_context(**context_common)
-                            else:
-                                self.context = await self.browser.new_context(
-                                    user_agent=(
-                                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                                        "Chrome/120.0.0.0 Safari/537.36"
-                                    ),
-                                    **context_common,
-                                )
-                            context_created_here = True
-                    # Cookie ブラックホール（任意）を context に注入（new_page より前）
-                    try:
-                        cookie_cfg = (self.config.get("worker_config", {}).get("browser", {}).get("cookie_control", {}) if isinstance(self.config, dict) else {})
-                    except Exception:
-                        cookie_cfg = {}
-                    # 既定は無効（誤検出/互換性への影響を避ける）。設定で明示有効化時のみON。
-                    await install_init_script(self.context, bool(cookie_cfg.get("override_document_cookie", False)))
+                            await self._acquire_context()
 
                     # playwright-stealth を初回のみ適用（v2: context単位）
                     await self._ensure_stealth(self.context)
-                    # 新規ページをオープン
-                    page = await self.context.new_page()
-                    # v1: ページ単位で stealth を適用
-                    try:
-                        if self._stealth_api == 'v1' and self._stealth_async_func:
-                            await self._stealth_async_func(page)
-                    except Exception:
-                        pass
-                    # UAの変更はmacOS GUIでは避けて安定性を優先。
-                    # Cookieコントロールのネットワーク層（CMPブロック/Set-Cookie除去 + 資源ブロックも統合）
-                    try:
-                        rb_rules = {
-                            "images": self._rb_block_images,
-                            "fonts": self._rb_block_fonts,
-                            "stylesheets": self._rb_block_stylesheets,
-                        }
-                        # 追加オプション（存在しない場合は安全な既定にフォールバック）
-                        s_third = bool(cookie_cfg.get("strip_set_cookie_third_party_only", True))
-                        s_domains = cookie_cfg.get("strip_set_cookie_domains", [])
-                        if not isinstance(s_domains, list):
-                            logger.warning("cookie_control.strip_set_cookie_domains must be a list; using empty list")
-                            s_domains = []
-                        s_exclude = cookie_cfg.get("strip_set_cookie_exclude_domains", [])
-                        if not isinstance(s_exclude, list):
-                            logger.warning("cookie_control.strip_set_cookie_exclude_domains must be a list; using empty list")
-                            s_exclude = []
-                        await install_cookie_routes(
-                            page,
-                            block_cmp_scripts=bool(cookie_cfg.get("block_cmp_scripts", True)),
-                            strip_set_cookie=bool(cookie_cfg.get("strip_set_cookie", False)),
-                            resource_block_rules=rb_rules,
-                            strip_set_cookie_third_party_only=s_third,
-                            strip_set_cookie_domains=list(s_domains),
-                            strip_set_cookie_exclude_domains=list(s_exclude),
-                        )
-                    except Exception:
-                        pass
-                    if not (platform.system().lower() == 'darwin' and (self.headless is False or self.headless is None)):
-                        await page.set_extra_http_headers({
-                            "User-Agent": (
-                                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                                "Chrome/120.0.0.0 Safari/537.36"
-                            ),
-                            "Accept-Language": "ja, en-US;q=0.8, en;q=0.7",
-                        })
-                    else:
-                        # macOS GUI でも Accept-Language を明示（UAはシステムChromeに委任）
+                    if page is None:
+                        # 新規ページをオープン
+                        page = await self.context.new_page()
+                        # v1: ページ単位で stealth を適用
                         try:
-                            await page.set_extra_http_headers({
-                                "Accept-Language": "ja, en-US;q=0.8, en;q=0.7",
-                            })
+                            if self._stealth_api == 'v1' and self._stealth_async_func:
+                                await self._stealth_async_func(page)
                         except Exception:
                             pass
+                    # Cookieコントロールのルート/追加ヘッダはコンテキスト作成時に登録済み（ページ単位の登録は不要）
 
-                    logger.info(f"Worker {self.worker_id}: Accessing target form page: ***URL_REDACTED***")
+                    logger.info("Worker %s: Accessing target form page: ***URL_REDACTED***", self.worker_id)
                     # 初期ロードは macOS GUI でも安定性重視で 'domcontentloaded' を既定とする
                     # （一部サイトで 'load' 待機中に対象が閉じられる事象を回避）
+                    # 初回は短めのタイムアウトで早期に見切り、再試行時のみ通常のタイムアウトに延長する
                     wait_state = 'domcontentloaded'
                     await page.goto(
                         form_url,
-                        timeout=int(self.timeout_settings.get("page_load", 30000)),
+                        timeout=self._page_load_timeout_ms(first_attempt=(i == 0)),
                         wait_until=wait_state,
                     )
                     # 追加の待機はローカルGUIでは行わない（安定優先）
-                    if not (platform.system().lower() == 'darwin' and (self.headless is False or self.headless is None)):
-                        try:
-                            await page.wait_for_load_state('networkidle', timeout=5000)
-                        except Exception:
-                            pass
+                    if self._use_win_ua:
+                        await self._wait_page_settled(page, timeout_ms=5000)
                     # バナーUIの Reject 自動操作（短時間）
                     try:
                         await try_reject_banners(
                             page,
-                            enabled=bool(cookie_cfg.get("ui_reject_banners", True)),
+                            enabled=self._ui_reject_banners,
                             timeout_ms=int(self.timeout_settings.get("click_timeout", 5000))
                         )
                     except Exception:
@@ -348,25 +466,9 @@ class BrowserManager:
                     return page
                 except PlaywrightTimeoutError as e:
                     last_err = e
-                    try:
-                        if page:
-                            await page.close()
-                    except Exception:
-                        pass
-                    # 当回で作成したcontextがあればクリーンアップ（リーク抑止）
-                    if context_created_here:
-                        try:
-                            if self.context:
-                                await self.context.close()
-                        except Exception as _ctx_close_err:
-                            try:
-                                logger.debug(f"Worker {self.worker_id}: context close on timeout failed: {_ctx_close_err}")
-                            except Exception:
-                                pass
-                        finally:
-                            self.context = None
-                            self._stealth_applied = False
-                    logger.error(f"Worker {self.worker_id}: Page load timeout for ***URL_REDACTED*** (attempt {i+1}/2)")
+                    # ページ読込の失敗でありコンテキスト/ページ自体は健全なため維持し、次回は goto のみ再試行
+                    # （最終的に失敗した場合のページは外側の _cleanup_context_on_error で閉じる）
+                    logger.error("Worker %s: Page load timeout for ***URL_REDACTED*** (attempt %d/2)", self.worker_id, i + 1)
                 except Exception as e:
                     last_err = e
                     try:
@@ -374,8 +476,9 @@ class BrowserManager:
                             await page.close()
                     except Exception:
                         pass
+                    page = None
                     # ターゲット/接続クローズは一度だけ再試行
-                    if any(k in str(e) for k in ["Target page", "Connection closed", "Browser connection lost", "Target closed"]):
+                    if _is_transient_error(e):
                         # コンテキストが壊れている可能性が高いので破棄して再生成させる
                         try:
                             if self.context:
@@ -384,11 +487,12 @@ class BrowserManager:
                             pass
                         # 破棄後は再適用させるためにフラグを落とす
                         self.context = None
-                        self._stealth_applied = False
-                        logger.warning(f"Worker {self.worker_id}: Retrying after transient page error (attempt {i+1}/2): {e}")
-                        await asyncio.sleep(0.5)
+                        self._stealth_applied.clear()
+                        logger.warning("Worker %s: Retrying after transient page error (attempt %s/2): %s", self.worker_id, i+1, e)
+                        # レート制限起因ではないため待機は不要（制御を譲るのみ。再試行回数は range(2) で有界）
+                        await asyncio.sleep(0)
                         continue
-                    logger.error(f"Worker {self.worker_id}: Page access error for ***URL_REDACTED*** {e}")
+                    logger.error("Worker %s: Page access error for ***URL_REDACTED*** %s", self.worker_id, e)
                     break
             # ここまで来たら最後のエラーを送出
             raise last_err or Exception("Unknown page access error")
@@ -399,7 +503,7 @@ class BrowserManager:
                 await self._cleanup_context_on_error()
             except Exception:
                 pass
-            logger.error(f"Worker {self.worker_id}: Page load timeout for ***URL_REDACTED***")
+            logger.error("Worker %s: Page load timeout for ***URL_REDACTED***", self.worker_id)
             raise e
         except Exception as e:
             # エラー時のクリーンアップ
@@ -407,23 +511,134 @@ class BrowserManager:
                 await self._cleanup_context_on_error()
             except Exception:
                 pass
-            logger.error(f"Worker {self.worker_id}: Page access error for ***URL_REDACTED*** {e}")
+            logger.error("Worker %s: Page access error for ***URL_REDACTED*** %s", self.worker_id, e)
             raise e
 
-    async def _ensure_context_health(self) -> None:
-        """コンテキストの健全性を検査し、壊れていれば再生成する。"""
-        if not self.context:
+    def _page_load_timeout_ms(self, first_attempt: bool) -> int:
+        """goto のタイムアウト（ms）。初回は page_load_first_attempt（未設定なら page_load）。"""
+        page_load = int(self.timeout_settings.get("page_load", 30000))
+        if first_attempt:
+            return int(self.timeout_settings.get("page_load_first_attempt", page_load))
+        return page_load
+
+    async def _wait_page_settled(self, page: Page, timeout_ms: int) -> None:
+        """networkidle と入力フォームの出現のうち早い方まで待つ（いずれもタイムアウトは無視）。
+
+        解析・入力に必要なのはフォーム要素であり、解析系スクリプト等で networkidle が
+        遅れるページでもフォームが揃った時点で先へ進める。
+        """
+        idle = asyncio.create_task(page.wait_for_load_state('networkidle', timeout=timeout_ms))
+        ready = asyncio.create_task(
+            page.wait_for_selector(_FORM_READY_SELECTOR, state='attached', timeout=timeout_ms)
+        )
+        pending = {idle, ready}
+        try:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # 先に失敗した側（タイムアウト等）しか終わっていない場合は、もう一方を引き続き待つ
+            if pending and not any(t.exception() is None for t in done):
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for t in pending:
+                t.cancel()
+            # 例外はすべて回収して未処理例外の警告を抑止
+            await asyncio.gather(idle, ready, return_exceptions=True)
+
+    def _context_key(self) -> tuple:
+        """プールのキーを構築（コンテキスト作成時の設定が同一なら再利用可能）。__init__ で一度だけ呼ぶ。"""
+        opts = self._cookie_route_opts
+        return (
+            self._use_win_ua,
+            self._stealth_enabled,
+            self._navigator_languages,
+            (self._rb_block_images, self._rb_block_fonts, self._rb_block_stylesheets),
+            self._cookie_override,
+            opts["block_cmp_scripts"],
+            opts["strip_set_cookie"],
+            opts["strip_set_cookie_third_party_only"],
+            tuple(opts["strip_set_cookie_domains"]),
+            tuple(opts["strip_set_cookie_exclude_domains"]),
+        )
+
+    async def _acquire_context(self) -> None:
+        """プールからコンテキストを取得（無ければ新規作成）して self.context に設定する。"""
+
+        async def _factory() -> BrowserContext:
+            ctx = await self.browser.new_context(**self._context_kwargs)
+            # 以降のナビゲーション（送信後の遷移等）の既定タイムアウトをコンテキスト単位で一度だけ設定
+            ctx.set_default_navigation_timeout(int(self.timeout_settings.get("page_load", 30000)))
+            self._stealth_applied.clear()
+            # 以下は互いに独立した CDP 往復のため並行発行する（いずれも失敗は握り潰して続行）
+            # - Cookie ブラックホール（任意）を context に注入（new_page より前）
+            # - Cookieコントロールのネットワーク層（CMPブロック/Set-Cookie除去 + 資源ブロックも統合）を
+            #   コンテキスト単位で1回だけ登録（配下の全ページに適用される）
+            # - playwright-stealth（v2: context単位）
+            await asyncio.gather(
+                install_init_script(ctx, self._cookie_override),
+                install_cookie_routes(ctx, **self._cookie_route_opts),
+                self._ensure_stealth(ctx),
+                return_exceptions=True,
+            )
+            return ctx
+
+        self.context, reused = await self._pool.acquire(
+            self.browser, self._pool_key, _factory
+        )
+        self._track_context(self.context)
+        if reused:
+            # プール内のコンテキストは初期化スクリプト/ステルス適用済み
+            self._stealth_applied.set()
+            logger.info("Worker %s: Reused pooled browser context", self.worker_id)
+
+    async def release_context(self) -> None:
+        """処理完了後に現在のコンテキストを閉じずにプールへ返却する（次回の create_new_page で再利用）。
+
+        閉じられている/上限超過のコンテキストはプール側で閉じる。
+        """
+        _lock = self._ensure_context_lock()
+        if _lock is not None:
+            async with _lock:
+                await self._release_context_locked()
+        else:
+            await self._release_context_locked()
+
+    async def _release_context_locked(self) -> None:
+        ctx = self.context
+        if ctx is None:
             return
+        self.context = None
+        self._stealth_applied.clear()
         try:
-            _ = self.context.pages
-        except Exception:
+            await self._pool.release(ctx, self._pool_key)
+        except Exception as e:
+            logger.debug("Worker %s: Context release failed, closing: %s", self.worker_id, e)
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+
+    async def _ensure_context_health(self) -> None:
+        """コンテキストの健全性を検査し、閉じられていれば再生成する。"""
+        if self.context and not self._context_alive:
             await self._recreate_context()
 
+    def _track_context(self, ctx: BrowserContext) -> None:
+        """ctx の close イベントで生存フラグを落とす（self.context が ctx の間のみ）。"""
+        self._context_alive = True
+        if ctx in self._tracked_contexts:
+            return
+        self._tracked_contexts.add(ctx)
+
+        def _on_close(_ctx) -> None:
+            if self.context is ctx:
+                self._context_alive = False
+
+        ctx.on("close", _on_close)
+
     async def _recreate_context(self) -> None:
         """安全にコンテキストを破棄し、次回作成に備える。"""
         old = self.context
         self.context = None
-        self._stealth_applied = False
+        self._stealth_applied.clear()
         if old:
             try:
                 await old.close()
@@ -460,9 +675,14 @@ class BrowserManager:
         - 既定では常に有効化。将来的に `config.worker_config.browser.stealth.enabled`
           のフラグを見て切り替える拡張を想定。
         """
+        if self._stealth_applied.is_set():
+            return
+        inflight = self._stealth_inflight
+        if inflight is not None:
+            await inflight.wait()
+            return
+        self._stealth_inflight = inflight = asyncio.Event()
         try:
-            if self._stealth_applied:
-                return
             # 設定フラグ（存在しない場合はデフォルト有効）
             enabled = True
             try:
@@ -470,26 +690,28 @@ class BrowserManager:
             except Exception:
                 enabled = True
             if not enabled:
-                self._stealth_applied = True  # 明示的に無効化されている場合は再適用不要
+                self._stealth_applied.set()  # 明示的に無効化されている場合は再適用不要
                 return
 
             if self._stealth_api == 'v2':
                 if self._stealth is None:
-                    try:
-                        from playwright_stealth import Stealth as _S  # type: ignore
-                        self._stealth = _S()
-                    except Exception:
+                    stealth_v2 = _resolve_stealth()[1]
+                    if stealth_v2 is None:
                         self._stealth_api = 'none'
                         return
+                    self._stealth = stealth_v2()
                 await self._stealth.apply_stealth_async(context)
-                self._stealth_applied = True
-                logger.info(f"Worker {self.worker_id}: Applied playwright-stealth v2 to context")
+                self._stealth_applied.set()
+                logger.info("Worker %s: Applied playwright-stealth v2 to context", self.worker_id)
             else:
                 # v1 はページ単位で new_page 後に適用するため、ここではフラグを変更しない
                 pass
         except Exception as e:
             # 失敗しても処理は続行（回避が無くても動作自体は可能）
-            logger.warning(f"Worker {self.worker_id}: Failed to apply stealth evasions (suppressed): {e}")
+            logger.warning("Worker %s: Failed to apply stealth evasions (suppressed): %s", self.worker_id, e)
+        finally:
+            self._stealth_inflight = None
+            inflight.set()
 
     async def _cleanup_context_on_error(self):
         """エラー時のコンテキストクリーンアップ"""
@@ -502,72 +724,114 @@ class BrowserManager:
                         await p.close()
                     except Exception:
                         pass
-                # ページを全て閉じてもコンテキストに異常がある場合は安全に破棄
-                try:
-                    _ = self.context.pages
-                except Exception:
+                # コンテキスト自体が閉じられている（close イベント受信済み）場合は安全に破棄
+                if not self._context_alive:
                     try:
                         await self.context.close()
                     except Exception:
                         pass
                     finally:
                         self.context = None
-                        self._stealth_applied = False
+                        self._stealth_applied.clear()
         except Exception:
             pass
 
     async def close(self):
         """ブラウザとPlaywrightインスタンスを閉じる"""
-        # コンテキストを先にクローズ
-        if self.context:
-            try:
-                await self.context.close()
-                logger.info(f"Worker {self.worker_id}: Context closed.")
-            except Exception as e:
-                if "Connection closed" in str(e) or "Target closed" in str(e):
-                    logger.warning(f"Worker {self.worker_id}: Context was already closed: {e}")
-                else:
-                    logger.error(f"Worker {self.worker_id}: Error closing context: {e}")
-            finally:
-                self.context = None
-                # 次回新規context作成時に再度ステルス適用を行う
-                self._stealth_applied = False
+        # 未完了のコンテキスト事前準備は中断する
+        if self._prewarm_task is not None:
+            if not self._prewarm_task.done():
+                self._prewarm_task.cancel()
+                try:
+                    await self._prewarm_task
+                except (asyncio.CancelledError, Exception):
+                    pass
+            self._prewarm_task = None
+        # 現コンテキストとプール内のアイドルコンテキストは互いに独立のため並行して閉じる
+        # （いずれもブラウザ終了より前に完了させる）
+        await asyncio.gather(
+            self._close_context(),
+            self._clear_pooled_contexts(),
+            return_exceptions=True,
+        )
+
+        if self.browser and self._shared_browser:
+            # 共有ブラウザは他ワーカーが利用中のため終了しない（接続は playwright.stop() で解放）
+            self.browser = None
+            self._shared_browser = False
+            logger.info("Worker %s: Detached from shared browser.", self.worker_id)
+
+        await self._close_browser()
+        # ステルスCMの終了は内部で Playwright を停止するため、ブラウザ終了後に直列で行う
+        await self._stop_playwright()
+
+    async def _close_context(self) -> None:
+        """現在のコンテキストを閉じる（既にクローズ済みは警告のみ）。"""
+        if not self.context:
+            return
+        try:
+            await self.context.close()
+            logger.info("Worker %s: Context closed.", self.worker_id)
+        except Exception as e:
+            if _is_already_closed_error(e):
+                logger.warning("Worker %s: Context was already closed: %s", self.worker_id, e)
+            else:
+                logger.error("Worker %s: Error closing context: %s", self.worker_id, e)
+        finally:
+            self.context = None
+            # 次回新規context作成時に再度ステルス適用を行う
+            self._stealth_applied.clear()
+
+    async def _clear_pooled_contexts(self) -> None:
+        """このブラウザに属するアイドルコンテキストを破棄（ブラウザ終了/切断で使えなくなるため）。"""
+        if not self.browser:
+            return
+        try:
+            await self._pool.clear(self.browser)
+        except Exception as e:
+            logger.debug("Worker %s: Context pool clear failed: %s", self.worker_id, e)
 
-        if self.browser:
+    async def _close_browser(self) -> None:
+        """自ワーカーが起動したブラウザを閉じる。"""
+        if not self.browser:
+            return
+        try:
+            # ブラウザが既に閉じられているかチェック
+            if hasattr(self.browser, '_connection') and self.browser._connection and not self.browser._connection._closed:
+                await self.browser.close()
+                logger.info("Worker %s: Browser closed.", self.worker_id)
+            else:
+                logger.info("Worker %s: Browser already closed.", self.worker_id)
+        except Exception as e:
+            # 接続が既に切れている場合は警告レベルでログ出力
+            if _is_already_closed_error(e):
+                logger.warning("Worker %s: Browser was already closed: %s", self.worker_id, e)
+            else:
+                logger.error("Worker %s: Error closing browser: %s", self.worker_id, e)
+        finally:
+            self.browser = None
+
+    async def _stop_playwright(self) -> None:
+        """ステルスCMを抜けた上で Playwright を停止する。"""
+        if not self.playwright:
+            return
+        # ステルス有無に関わらず、最終的に stop() を試みてプロセスリークを防ぐ
+        try:
+            if self._stealth_cm is not None:
+                try:
+                    await self._stealth_cm.__aexit__(None, None, None)
+                    logger.info("Worker %s: Stealth context manager exited.", self.worker_id)
+                finally:
+                    # CM 参照は破棄して以降の停止処理に影響しないようにする
+                    self._stealth_cm = None
+            # 冪等に stop() を呼ぶ（ステルス側で停止済みでも例外を握り潰して継続）
             try:
-                # ブラウザが既に閉じられているかチェック
-                if hasattr(self.browser, '_connection') and self.browser._connection and not self.browser._connection._closed:
-                    await self.browser.close()
-                    logger.info(f"Worker {self.worker_id}: Browser closed.")
-                else:
-                    logger.info(f"Worker {self.worker_id}: Browser already closed.")
+                await self.playwright.stop()
+                logger.info("Worker %s: Playwright stopped.", self.worker_id)
             except Exception as e:
-                # 接続が既に切れている場合は警告レベルでログ出力
-                if "Connection closed" in str(e) or "Target closed" in str(e) or "invalid state" in str(e):
-                    logger.warning(f"Worker {self.worker_id}: Browser was already closed: {e}")
+                if _is_already_closed_error(e):
+                    logger.warning("Worker %s: Playwright was already stopped: %s", self.worker_id, e)
                 else:
-                    logger.error(f"Worker {self.worker_id}: Error closing browser: {e}")
-            finally:
-                self.browser = None
-
-        if self.playwright:
-            # ステルス有無に関わらず、最終的に stop() を試みてプロセスリークを防ぐ
-            try:
-                if self._stealth_cm is not None:
-                    try:
-                        await self._stealth_cm.__aexit__(None, None, None)
-                        logger.info(f"Worker {self.worker_id}: Stealth context manager exited.")
-                    finally:
-                        # CM 参照は破棄して以降の停止処理に影響しないようにする
-                        self._stealth_cm = None
-                # 冪等に stop() を呼ぶ（ステルス側で停止済みでも例外を握り潰して継続）
-                try:
-                    await self.playwright.stop()
-                    logger.info(f"Worker {self.worker_id}: Playwright stopped.")
-                except Exception as e:
-                    if "invalid state" in str(e) or "Connection closed" in str(e):
-                        logger.warning(f"Worker {self.worker_id}: Playwright was already stopped: {e}")
-                    else:
-                        logger.error(f"Worker {self.worker_id}: Error stopping Playwright: {e}")
-            finally:
-                self.playwright = None
+                    logger.error("Worker %s: Error stopping Playwright: %s", self.worker_id, e)
+        finally:
+            self.playwright = None
@@ -0,0 +1,69 @@
+"""
+プロセス間キューのペイロード符号化
+
+任意依存の msgspec が利用可能な場合は MessagePack で符号化し、未導入環境や
+MessagePack で表現できない値を含む場合は pickle へフォールバックする。
+先頭1バイトのタグで方式を判別するため、送受信側で方式が混在しても復号できる。
+ペイロードは WorkerTask/WorkerResult.to_dict() の JSON 互換 dict を想定する
+（MessagePack 経由では tuple は list として復元される）。datetime/Decimal 等は
+msgspec が文字列化してしまい型が戻らないため、スカラーが JSON 互換型だけで
+構成される場合に限り MessagePack を使い、それ以外は pickle で送る。
+"""
+
+import pickle
+from typing import Any, Union
+
+try:
+    import msgspec  # type: ignore
+except ImportError:  # 任意依存（未導入時は pickle）
+    msgspec = None
+
+_TAG_MSGPACK = 0x6D  # b"m"
+_TAG_PICKLE = 0x70  # b"p"
+
+_ENCODER = msgspec.msgpack.Encoder() if msgspec is not None else None
+_DECODER = msgspec.msgpack.Decoder() if msgspec is not None else None
+
+# MessagePack で型を保ったまま往復できるスカラー型
+_MSGPACK_SCALARS = (str, int, float, bool, bytes, type(None))
+
+
+def _msgpack_safe(obj: Any) -> bool:
+    """obj が MessagePack で型を失わずに往復できる値だけで構成されるか。"""
+    stack = [obj]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    return False
+                stack.append(item)
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif type(value) not in _MSGPACK_SCALARS:
+            # datetime/date/Decimal/set/Enum 等は文字列化・list 化されるため pickle へ
+            return False
+    return True
+
+
+def encode_payload(obj: Any) -> Union[bytes, bytearray]:
+    """obj をタグ付きのバイト列に符号化する。"""
+    if _ENCODER is not None and _msgpack_safe(obj):
+        buf = bytearray((_TAG_MSGPACK,))
+        try:
+            _ENCODER.encode_into(obj, buf, 1)
+            return buf
+        except Exception:
+            # 整数のオーバーフロー等、MessagePack で表現できない値は pickle へ
+            pass
+    return bytes((_TAG_PICKLE,)) + pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_payload(data: Union[bytes, bytearray]) -> Any:
+    """encode_payload で符号化したバイト列を復号する。"""
+    body = memoryview(data)[1:]
+    if data[0] == _TAG_MSGPACK:
+        if _DECODER is None:
+            raise RuntimeError("msgspec is required to decode this payload")
+        return _DECODER.decode(body)
+    return pickle.loads(body)
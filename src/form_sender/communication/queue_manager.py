@@ -4,17 +4,41 @@
 オーケストレーターとワーカープロセス間の通信を管理する
 """
 
+import array
+import bisect
 import logging
-import multiprocessing as mp
+import os
 import queue
 import time
-import uuid
-from typing import Dict, Any, Optional, List, Tuple
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+from dataclasses import dataclass, replace
 from enum import Enum
 
+from .codec import decode_payload
+from .shm_ring import PayloadTooLargeError, ShmRingQueue
+
 logger = logging.getLogger(__name__)
 
+# ワーカー状態コード（worker_status の値）。外部へは check_worker_health の文字列で返す
+WORKER_STATUS_UNKNOWN = 0
+WORKER_STATUS_READY = 1
+WORKER_STATUS_SHUTDOWN = 2
+
+# バックプレッシャー検知閾値（タスク/結果キューの滞留件数）
+HIGH_BACKPRESSURE_THRESHOLD = 150  # 100 -> 150
+MEDIUM_BACKPRESSURE_THRESHOLD = 70  # 50 -> 70
+
+# 秒 -> ナノ秒（時刻は time.monotonic_ns() の整数で保持し、秒への変換はログ/統計出力時のみ）
+_NS_PER_S = 1_000_000_000
+
+# pending タスクの年齢分布（境界は ns、ラベルは境界で区切られた各区間に対応）
+_AGE_BUCKET_EDGES_NS: Tuple[int, ...] = (60 * _NS_PER_S, 300 * _NS_PER_S, 600 * _NS_PER_S)
+_AGE_BUCKET_LABELS: Tuple[str, ...] = ('<1min', '1-5min', '5-10min', '>10min')
+
+# 完了タスク結果の保持上限（超過時は古いものから破棄）
+COMPLETED_TASKS_CAP = 4096
+
 
 class QueueManagerError(Exception):
     """キューマネージャーの基本例外クラス"""
@@ -48,6 +72,11 @@ class ResultStatus(Enum):
     WORKER_SHUTDOWN = "worker_shutdown"
 
 
+# 値 -> Enum メンバーの逆引き（from_dict で Enum.__call__ を経由しない）
+_TASK_TYPE_BY_VALUE: Dict[str, TaskType] = {m.value: m for m in TaskType}
+_RESULT_STATUS_BY_VALUE: Dict[str, ResultStatus] = {m.value: m for m in ResultStatus}
+
+
 @dataclass
 class WorkerTask:
     """ワーカータスクのデータ構造"""
@@ -60,17 +89,22 @@ class WorkerTask:
     # instruction_json削除 - RuleBasedAnalyzerのリアルタイム解析のみを使用
     
     def to_dict(self) -> Dict[str, Any]:
-        """辞書形式に変換"""
-        result = asdict(self)
-        # Enumを文字列に変換
-        result['task_type'] = self.task_type.value
-        return result
+        """辞書形式に変換（Enumは文字列。ネストした dict は複製せず参照を渡す）"""
+        return {
+            'task_id': self.task_id,
+            'task_type': self.task_type.value,
+            'company_data': self.company_data,
+            'client_data': self.client_data,
+            'targeting_id': self.targeting_id,
+            'worker_id': self.worker_id,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WorkerTask':
         """辞書から作成"""
-        # 文字列をEnumに変換
-        data['task_type'] = TaskType(data['task_type'])
+        # 文字列をEnumに変換（未知の値は従来どおり ValueError）
+        value = data['task_type']
+        data['task_type'] = _TASK_TYPE_BY_VALUE.get(value) or TaskType(value)
         return cls(**data)
 
 
@@ -89,17 +123,26 @@ class WorkerResult:
     additional_data: Optional[Dict[str, Any]] = None  # form_finder等の拡張データ用
     
     def to_dict(self) -> Dict[str, Any]:
-        """辞書形式に変換"""
-        result = asdict(self)
-        # Enumを文字列に変換
-        result['status'] = self.status.value
-        return result
+        """辞書形式に変換（Enumは文字列。ネストした dict は複製せず参照を渡す）"""
+        return {
+            'task_id': self.task_id,
+            'worker_id': self.worker_id,
+            'status': self.status.value,
+            'record_id': self.record_id,
+            'error_type': self.error_type,
+            'error_message': self.error_message,
+            'instruction_valid_updated': self.instruction_valid_updated,
+            'bot_protection_detected': self.bot_protection_detected,
+            'processing_time': self.processing_time,
+            'additional_data': self.additional_data,
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'WorkerResult':
         """辞書から作成"""
-        # 文字列をEnumに変換
-        data['status'] = ResultStatus(data['status'])
+        # 文字列をEnumに変換（未知の値は従来どおり ValueError）
+        value = data['status']
+        data['status'] = _RESULT_STATUS_BY_VALUE.get(value) or ResultStatus(value)
         return cls(**data)
 
 
@@ -115,35 +158,38 @@ class QueueManager:
         """
         self.num_workers = num_workers
         
-        # プロセス間通信キュー
-        self.task_queue = mp.Queue()
-        self.result_queue = mp.Queue()
+        # プロセス間通信キュー（共有メモリ上のリング。パイプ/フィーダースレッドを経由しない）
+        self.task_queue = ShmRingQueue()
+        self.result_queue = ShmRingQueue()
         
         # タスク管理
-        self.pending_tasks = {}  # task_id -> WorkerTask
-        self.completed_tasks = {}  # task_id -> WorkerResult
+        self.pending_tasks: Dict[str, Tuple[WorkerTask, int]] = {}  # task_id -> (WorkerTask, 送信時刻 monotonic_ns)
+        self.completed_tasks: "OrderedDict[str, WorkerResult]" = OrderedDict()  # task_id -> WorkerResult（直近分のみ）
+        self._completed_cap = COMPLETED_TASKS_CAP
         self.task_counter = 0
+        # タスクIDの接頭辞（プロセス内で不変）
+        self._pid_prefix = f"{os.getpid():x}"
         
         # ワーカー状態管理
-        self.worker_status = {}  # worker_id -> status
-        self.worker_last_heartbeat = {}  # worker_id -> timestamp
+        # worker_id（0..num_workers-1）で直接引く配列（範囲外の worker_id を受信した場合は拡張）
+        self.worker_status = bytearray(num_workers)  # worker_id -> WORKER_STATUS_*
+        self.worker_last_heartbeat = array.array('q', [0] * num_workers)  # worker_id -> monotonic_ns
         
         # 統計情報
         self.stats = {
             'tasks_sent': 0,
             'results_received': 0,
-            'errors': 0,
-            'start_time': time.time()
+            'errors': 0
         }
+        self._start_ns = time.monotonic_ns()
         
         logger.info(f"QueueManager initialized with {num_workers} workers")
     
     def generate_task_id(self) -> str:
-        """一意なタスクIDを生成（UUID + カウンターベース）"""
+        """一意なタスクIDを生成（PID + カウンターベース）"""
         self.task_counter += 1
-        # UUIDの先頭8文字 + タスクカウンターで衝突リスクを排除
-        uuid_prefix = uuid.uuid4().hex[:8]
-        return f"task_{uuid_prefix}_{self.task_counter}"
+        # 実行内での一意性のみ必要なため、乱数は使わず PID + 単調カウンターで構成
+        return f"task_{self._pid_prefix}_{self.task_counter}"
     
     def send_task(self, company_data: Dict[str, Any], client_data: Optional[Dict[str, Any]] = None, 
                   targeting_id: Optional[int] = None) -> str:
@@ -172,7 +218,7 @@ class QueueManager:
         try:
             # タスクを辞書形式でキューに送信
             self.task_queue.put(task.to_dict(), timeout=5)
-            self.pending_tasks[task_id] = task
+            self.pending_tasks[task_id] = (task, time.monotonic_ns())
             self.stats['tasks_sent'] += 1
             
             logger.debug(f"Task sent: {task_id} for company {company_data.get('id')}")
@@ -187,6 +233,58 @@ class QueueManager:
                 f"Current queue size: {queue_size}. "
                 f"Consider increasing max_pending_tasks or reducing batch size."
             )
+        except PayloadTooLargeError as e:
+            logger.error(f"Task {task_id} payload exceeds task queue capacity")
+            raise QueueOverflowError(f"Task payload too large for task queue: {task_id}. {e}") from e
+    
+    def send_tasks(self, company_data_list: List[Dict[str, Any]], client_data: Optional[Dict[str, Any]] = None,
+                   targeting_id: Optional[int] = None) -> List[str]:
+        """
+        複数の企業処理タスクをまとめてワーカーに送信（キューへの書き込みは1回にまとめる）
+        
+        ワーカー側では send_task と同じく1件ずつのタスクとして受信される。
+        
+        Args:
+            company_data_list: 企業データのリスト
+            client_data: クライアントデータ（全タスク共通、オプション）
+            targeting_id: ターゲティングID（全タスク共通、オプション）
+            
+        Returns:
+            List[str]: 生成されたタスクIDのリスト（送信順）
+        """
+        tasks = [
+            WorkerTask(
+                task_id=self.generate_task_id(),
+                task_type=TaskType.PROCESS_COMPANY,
+                company_data=company_data,
+                client_data=client_data,
+                targeting_id=targeting_id
+            )
+            for company_data in company_data_list
+        ]
+        if not tasks:
+            return []
+        
+        try:
+            sent = self.task_queue.put_many([task.to_dict() for task in tasks], timeout=5)
+        except PayloadTooLargeError as e:
+            # 容量超過は書き込み前に検出されるため、この場合は1件も送信されていない
+            logger.error(f"Batched task payload exceeds task queue capacity ({len(tasks)} tasks not sent)")
+            raise QueueOverflowError(f"Task payload too large for task queue. {e}") from e
+        submitted_at = time.monotonic_ns()
+        for task in tasks[:sent]:
+            self.pending_tasks[task.task_id] = (task, submitted_at)
+        self.stats['tasks_sent'] += sent
+        logger.debug(f"Tasks sent in batch: {sent}/{len(tasks)}")
+        
+        if sent < len(tasks):
+            logger.error(f"Task queue is full, could not send {len(tasks) - sent} of {len(tasks)} batched tasks")
+            raise QueueOverflowError(
+                f"Task queue overflow: sent {sent}/{len(tasks)} tasks in batch. "
+                f"Current queue size: {self.task_queue.qsize()}. "
+                f"Consider increasing max_pending_tasks or reducing batch size."
+            )
+        return [task.task_id for task in tasks]
     
     def get_result(self, timeout: Optional[float] = None) -> Optional[WorkerResult]:
         """
@@ -205,39 +303,12 @@ class QueueManager:
             else:
                 result_data = self.result_queue.get(timeout=timeout)
             
-            # データ型チェック: 既にWorkerResultオブジェクトの場合はそのまま使用
-            if isinstance(result_data, WorkerResult):
-                result = result_data
-            else:
-                # 辞書の場合のみfrom_dictで変換
-                result = WorkerResult.from_dict(result_data)
+            # ワーカーは常に to_dict() した辞書を送信する
+            result = WorkerResult.from_dict(result_data)
             
             # 統計更新
             self.stats['results_received'] += 1
-            
-            # ワーカー状態更新
-            if result.status == ResultStatus.WORKER_READY:
-                self.worker_status[result.worker_id] = 'ready'
-                self.worker_last_heartbeat[result.worker_id] = time.time()
-                logger.debug(f"Worker {result.worker_id} is ready")
-                
-            elif result.status == ResultStatus.WORKER_SHUTDOWN:
-                self.worker_status[result.worker_id] = 'shutdown'
-                logger.info(f"Worker {result.worker_id} has shut down")
-                
-            else:
-                # 処理結果の場合
-                task_id = result.task_id
-                if task_id in self.pending_tasks:
-                    self.completed_tasks[task_id] = result
-                    del self.pending_tasks[task_id]
-                    
-                    if result.status == ResultStatus.ERROR:
-                        self.stats['errors'] += 1
-                        logger.warning(f"Task {task_id} completed with error: {result.error_message}")
-                    else:
-                        logger.debug(f"Task {task_id} completed: {result.status.value}")
-            
+            self._apply_result(result)
             return result
             
         except queue.Empty:
@@ -249,21 +320,81 @@ class QueueManager:
                 f"Failed to retrieve worker result from queue: {e}"
             )
     
+    def _apply_result(self, result: WorkerResult) -> None:
+        """受信した結果をワーカー状態/タスク管理に反映"""
+        # ワーカー状態更新
+        if result.status == ResultStatus.WORKER_READY:
+            if not self._ensure_worker_slot(result.worker_id):
+                return
+            self.worker_status[result.worker_id] = WORKER_STATUS_READY
+            self.worker_last_heartbeat[result.worker_id] = time.monotonic_ns()
+            logger.debug(f"Worker {result.worker_id} is ready")
+            
+        elif result.status == ResultStatus.WORKER_SHUTDOWN:
+            if not self._ensure_worker_slot(result.worker_id):
+                return
+            self.worker_status[result.worker_id] = WORKER_STATUS_SHUTDOWN
+            logger.info(f"Worker {result.worker_id} has shut down")
+            
+        else:
+            # 処理結果の場合
+            task_id = result.task_id
+            if task_id in self.pending_tasks:
+                self.completed_tasks[task_id] = result
+                self.completed_tasks.move_to_end(task_id)
+                if len(self.completed_tasks) > self._completed_cap:
+                    self.completed_tasks.popitem(last=False)
+                del self.pending_tasks[task_id]
+                
+                if result.status == ResultStatus.ERROR:
+                    self.stats['errors'] += 1
+                    logger.warning(f"Task {task_id} completed with error: {result.error_message}")
+                else:
+                    logger.debug(f"Task {task_id} completed: {result.status.value}")
+    
+    def _ensure_worker_slot(self, worker_id: int) -> bool:
+        """worker_id が配列範囲外なら拡張する（通常は num_workers 未満のため何もしない）
+
+        負の worker_id は末尾からの添字として他ワーカーの状態を上書きしてしまうため拒否し False を返す。
+        """
+        if worker_id < 0:
+            logger.warning(f"Ignoring worker status update with invalid worker_id: {worker_id}")
+            return False
+        missing = worker_id + 1 - len(self.worker_status)
+        if missing > 0:
+            self.worker_status.extend(bytes(missing))
+            self.worker_last_heartbeat.extend([0] * missing)
+        return True
+    
     def get_all_available_results(self) -> List[WorkerResult]:
         """
         利用可能な全ての結果を取得（ノンブロッキング）
         
+        キューのロック取得は1回のみで滞留分を一括で取り出し、復号・変換と状態反映はロック外で1件ずつ行う。
+        
         Returns:
             List[WorkerResult]: 結果リスト
         """
-        results = []
+        try:
+            drained = self.result_queue.drain_bytes()
+        except Exception as e:
+            logger.error(f"Unexpected error draining result queue: {e}")
+            raise WorkerCommunicationError(
+                f"Failed to retrieve worker results from queue: {e}"
+            )
         
-        while True:
-            result = self.get_result(timeout=None)  # ノンブロッキング
-            if result is None:
-                break
+        results = []
+        for payload in drained:
+            try:
+                result = WorkerResult.from_dict(decode_payload(payload))
+            except Exception as e:
+                # 一括取得済みのため1件の不正で残りを失わないよう、該当分のみ破棄して続行
+                logger.error(f"Discarding malformed worker result: {e}")
+                continue
+            self._apply_result(result)
             results.append(result)
         
+        self.stats['results_received'] += len(results)
         return results
     
     def send_shutdown_signal(self):
@@ -294,9 +425,9 @@ class QueueManager:
         """
         logger.info(f"Waiting for {self.num_workers} workers to shutdown...")
         shutdown_count = 0
-        start_time = time.time()
+        deadline_ns = time.monotonic_ns() + int(timeout * _NS_PER_S)
         
-        while shutdown_count < self.num_workers and (time.time() - start_time) < timeout:
+        while shutdown_count < self.num_workers and time.monotonic_ns() < deadline_ns:
             result = self.get_result(timeout=1)
             if result and result.status == ResultStatus.WORKER_SHUTDOWN:
                 shutdown_count += 1
@@ -319,7 +450,9 @@ class QueueManager:
         Returns:
             Dict[int, str]: worker_id -> status のマップ
         """
-        current_time = time.time()
+        current_ns = time.monotonic_ns()
+        degraded_ns = int(heartbeat_timeout * _NS_PER_S)
+        unresponsive_ns = degraded_ns * 2
         health_status = {}
         
         # キューサイズ取得（バックプレッシャー検知用）
@@ -330,33 +463,39 @@ class QueueManager:
             task_queue_size = 0
             result_queue_size = 0
         
-        # バックプレッシャー検知閾値（調整）
-        high_backpressure_threshold = 150  # 100 -> 150
-        medium_backpressure_threshold = 70  # 50 -> 70
-        
-        for worker_id, status in self.worker_status.items():
-            last_heartbeat = self.worker_last_heartbeat.get(worker_id, 0)
-            heartbeat_age = current_time - last_heartbeat
+        # キュー由来の状態は全ワーカー共通のため、ループ前に一度だけ判定
+        # (状態, ログレベル, ログ文言) — ハートビートが健全なワーカーにのみ適用
+        if task_queue_size > HIGH_BACKPRESSURE_THRESHOLD:
+            queue_status = ('high_backpressure', logging.WARNING,
+                            f"experiencing high backpressure (queue size: {task_queue_size})")
+        elif task_queue_size > MEDIUM_BACKPRESSURE_THRESHOLD:
+            queue_status = ('medium_backpressure', logging.INFO,
+                            f"experiencing medium backpressure (queue size: {task_queue_size})")
+        elif result_queue_size > HIGH_BACKPRESSURE_THRESHOLD:
+            queue_status = ('result_backpressure', logging.WARNING,
+                            f"result queue backpressure (queue size: {result_queue_size})")
+        else:
+            queue_status = ('healthy', None, None)
+        queue_state, queue_log_level, queue_log_msg = queue_status
+        
+        for worker_id, status_code in enumerate(self.worker_status):
+            if status_code == WORKER_STATUS_UNKNOWN:
+                continue
+            last_heartbeat = self.worker_last_heartbeat[worker_id]
+            heartbeat_age_ns = current_ns - last_heartbeat
             
-            if status == 'shutdown':
+            if status_code == WORKER_STATUS_SHUTDOWN:
                 health_status[worker_id] = 'shutdown'
-            elif heartbeat_age > heartbeat_timeout * 2:  # 240秒で完全応答なし判定
+            elif heartbeat_age_ns > unresponsive_ns:  # 240秒で完全応答なし判定
                 health_status[worker_id] = 'unresponsive'
-                logger.warning(f"Worker {worker_id} appears unresponsive (last heartbeat: {heartbeat_age:.1f}s ago)")
-            elif heartbeat_age > heartbeat_timeout:  # 120秒で劣化判定
+                logger.warning(f"Worker {worker_id} appears unresponsive (last heartbeat: {heartbeat_age_ns / _NS_PER_S:.1f}s ago)")
+            elif heartbeat_age_ns > degraded_ns:  # 120秒で劣化判定
                 health_status[worker_id] = 'degraded'
-                logger.info(f"Worker {worker_id} degraded (heartbeat age: {heartbeat_age:.1f}s)")
-            elif task_queue_size > high_backpressure_threshold:
-                health_status[worker_id] = 'high_backpressure'
-                logger.warning(f"Worker {worker_id} experiencing high backpressure (queue size: {task_queue_size})")
-            elif task_queue_size > medium_backpressure_threshold:
-                health_status[worker_id] = 'medium_backpressure'
-                logger.info(f"Worker {worker_id} experiencing medium backpressure (queue size: {task_queue_size})")
-            elif result_queue_size > high_backpressure_threshold:
-                health_status[worker_id] = 'result_backpressure'
-                logger.warning(f"Worker {worker_id} result queue backpressure (queue size: {result_queue_size})")
+                logger.info(f"Worker {worker_id} degraded (heartbeat age: {heartbeat_age_ns / _NS_PER_S:.1f}s)")
             else:
-                health_status[worker_id] = 'healthy'
+                health_status[worker_id] = queue_state
+                if queue_log_level is not None:
+                    logger.log(queue_log_level, f"Worker {worker_id} {queue_log_msg}")
         
         return health_status
     
@@ -366,7 +505,7 @@ class QueueManager:
     
     def get_stats(self) -> Dict[str, Any]:
         """統計情報を取得"""
-        elapsed_time = time.time() - self.stats['start_time']
+        elapsed_time = (time.monotonic_ns() - self._start_ns) / _NS_PER_S
         
         return {
             'elapsed_time': elapsed_time,
@@ -392,34 +531,31 @@ class QueueManager:
         Returns:
             List[str]: 回復されたタスクIDのリスト
         """
-        current_time = time.time()
+        current_ns = time.monotonic_ns()
+        timeout_ns = int(timeout_seconds * _NS_PER_S)
         recovered_tasks = []
         
         # 長時間pending状態のタスクを特定
+        # pending_tasks は送信時刻順（挿入順）のため、タイムアウト未満のタスクに達した時点で打ち切る
         tasks_to_recover = []
-        for task_id, task in self.pending_tasks.items():
-            # タスクの送信時刻を推定（task_idから時刻情報を抽出）
-            try:
-                # task_id形式: task_{uuid}_{counter} の想定
-                task_age = current_time - (self.stats['start_time'] + self.task_counter - len(self.pending_tasks))
-                if task_age > timeout_seconds:
-                    tasks_to_recover.append(task_id)
-                    logger.warning(f"Task {task_id} has been pending for {task_age:.1f}s, marking for recovery")
-            except:
-                # 時刻推定失敗の場合、安全側でタイムアウト扱い
-                tasks_to_recover.append(task_id)
+        for task_id, task_age_ns in self._iter_pending_ages_ns(current_ns):
+            if task_age_ns <= timeout_ns:
+                break
+            tasks_to_recover.append(task_id)
+            logger.warning(f"Task {task_id} has been pending for {task_age_ns / _NS_PER_S:.1f}s, marking for recovery")
         
         # 回復処理：pending状態から削除し、再送信キューに追加
         for task_id in tasks_to_recover:
             if task_id in self.pending_tasks:
-                task = self.pending_tasks[task_id]
+                task, _ = self.pending_tasks[task_id]
                 # タスクを再送信キューに戻す（新しいIDで）
                 new_task_id = self.generate_task_id()
-                task['task_id'] = new_task_id
+                new_task = replace(task, task_id=new_task_id)
                 
                 try:
-                    self.task_queue.put(task, timeout=1)
+                    self.task_queue.put(new_task.to_dict(), timeout=1)
                     del self.pending_tasks[task_id]
+                    self.pending_tasks[new_task_id] = (new_task, time.monotonic_ns())
                     recovered_tasks.append(task_id)
                     logger.info(f"Task {task_id} recovered as {new_task_id}")
                 except queue.Full:
@@ -430,6 +566,11 @@ class QueueManager:
         
         return recovered_tasks
     
+    def _iter_pending_ages_ns(self, current_ns: int) -> Iterator[Tuple[str, int]]:
+        """pending タスクを (task_id, 経過ns) で送信時刻の古い順に列挙"""
+        for task_id, (_task, submitted_at) in self.pending_tasks.items():
+            yield task_id, current_ns - submitted_at
+    
     def get_pending_task_summary(self) -> Dict[str, Any]:
         """
         pending タスクの詳細サマリーを取得
@@ -437,28 +578,24 @@ class QueueManager:
         Returns:
             Dict[str, Any]: pending タスクの統計情報
         """
-        current_time = time.time()
+        current_ns = time.monotonic_ns()
         
-        # 年齢別分布
-        age_distribution = {'<1min': 0, '1-5min': 0, '5-10min': 0, '>10min': 0}
+        # 年齢別分布（区間は境界の二分探索で決定）
+        counts = [0] * len(_AGE_BUCKET_LABELS)
+        for _task_id, age_ns in self._iter_pending_ages_ns(current_ns):
+            counts[bisect.bisect_right(_AGE_BUCKET_EDGES_NS, age_ns)] += 1
+        age_distribution = dict(zip(_AGE_BUCKET_LABELS, counts))
         
-        for task_id, task in self.pending_tasks.items():
-            # 簡易的な年齢推定
-            estimated_age = current_time - (self.stats['start_time'] + self.task_counter - len(self.pending_tasks))
-            
-            if estimated_age < 60:
-                age_distribution['<1min'] += 1
-            elif estimated_age < 300:
-                age_distribution['1-5min'] += 1
-            elif estimated_age < 600:
-                age_distribution['5-10min'] += 1
-            else:
-                age_distribution['>10min'] += 1
+        # 先頭が最古（送信時刻順）
+        oldest_age = 0
+        if self.pending_tasks:
+            _task, oldest_submitted_at = next(iter(self.pending_tasks.values()))
+            oldest_age = max(0, current_ns - oldest_submitted_at) / _NS_PER_S
         
         return {
             'total_pending': len(self.pending_tasks),
             'age_distribution': age_distribution,
-            'oldest_task_age_estimate': max(0, current_time - (self.stats['start_time'] + 1)) if self.pending_tasks else 0
+            'oldest_task_age_estimate': oldest_age
         }
     
     def cleanup(self):
@@ -471,33 +608,25 @@ class QueueManager:
             summary = self.get_pending_task_summary()
             logger.warning(f"Pending task summary: {summary}")
         
-        # キューのクリーンアップ
-        try:
-            # 残タスクをクリア
-            task_count = 0
-            while not self.task_queue.empty():
-                self.task_queue.get_nowait()
-                task_count += 1
-            if task_count > 0:
-                logger.info(f"Cleared {task_count} remaining tasks from queue")
-        except:
-            pass
-            
-        try:
-            # 残結果をクリア  
-            result_count = 0
-            while not self.result_queue.empty():
-                self.result_queue.get_nowait()
-                result_count += 1
-            if result_count > 0:
-                logger.info(f"Cleared {result_count} remaining results from queue")
-        except:
-            pass
+        # キューのクリーンアップ（残件は取り出さず、件数のみ記録して共有メモリごと解放）
+        for name, q in (('tasks', self.task_queue), ('results', self.result_queue)):
+            try:
+                remaining = q.qsize()
+                if remaining > 0:
+                    logger.info(f"Discarding {remaining} remaining {name} from queue")
+            except Exception:
+                pass
+            try:
+                # 生成元プロセスでは名前も削除
+                q.close()
+            except Exception:
+                pass
         
         # 内部状態をクリア
         self.pending_tasks.clear()
         self.completed_tasks.clear()
-        self.worker_status.clear()
-        self.worker_last_heartbeat.clear()
+        self.worker_status[:] = bytes(len(self.worker_status))
+        for i in range(len(self.worker_last_heartbeat)):
+            self.worker_last_heartbeat[i] = 0
         
         logger.info("QueueManager cleanup completed")
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+共有メモリ上のリングバッファによるプロセス間キュー
+
+mp.Queue はメッセージごとに OS パイプ + フィーダースレッド経由でコピーされるため、
+SharedMemory 上の可変長レコードのリング（長さプレフィクス + ペイロード）へ直接書き込み、
+コンシューマはそこから直接読み出す。API は本パッケージが利用する mp.Queue の範囲
+（put/get/get_nowait/qsize/empty/close/join_thread）に合わせ、満杯/空は queue.Full/queue.Empty で通知する。
+mp.Queue と異なり容量は固定のため、リング全体に収まらないペイロードは PayloadTooLargeError となる。
+"""
+
+import logging
+import multiprocessing as mp
+import os
+import queue
+import struct
+from multiprocessing import shared_memory
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+from .codec import decode_payload, encode_payload
+
+logger = logging.getLogger(__name__)
+
+# リング容量（バイト）。2 のべき乗に切り上げ、オフセットはマスクで折り返す
+DEFAULT_CAPACITY = 4 * 1024 * 1024
+
+# レコードヘッダ（ペイロード長, little-endian uint32）
+_LEN = struct.Struct("<I")
+
+
+class PayloadTooLargeError(ValueError):
+    """ペイロード（長さヘッダ込み）がリング容量を超えるため書き込めない。"""
+
+
+def _round_pow2(n: int) -> int:
+    return 1 << max(0, int(n) - 1).bit_length()
+
+
+class ShmRingQueue:
+    """SharedMemory 上のバイトリングによる MPMC キュー。
+
+    head/tail は単調増加するバイトオフセット（共有 ctypes 値）で、読み書きは1本のロック下で行う
+    （Python には共有メモリ上の CAS が無いため予約はロックで直列化する）。空/満杯の待機は
+    Condition で行い、ビジーループはしない。プロセス間の受け渡しは mp.Queue と同じく
+    Process 起動時の継承のみ対応。
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, ctx: Optional[Any] = None):
+        ctx = ctx or mp.get_context()
+        self._capacity = _round_pow2(capacity)
+        self._mask = self._capacity - 1
+        self._shm = shared_memory.SharedMemory(create=True, size=self._capacity)
+        self._owner_pid = os.getpid()
+        self._head = ctx.Value("Q", 0, lock=False)
+        self._tail = ctx.Value("Q", 0, lock=False)
+        self._count = ctx.Value("Q", 0, lock=False)
+        self._lock = ctx.Lock()
+        self._not_empty = ctx.Condition(self._lock)
+        self._not_full = ctx.Condition(self._lock)
+        self._closed = False
+
+    # --- pickling（子プロセス起動時の継承用） ---------------------------------
+    def __getstate__(self):
+        return (
+            self._shm.name, self._capacity, self._owner_pid,
+            self._head, self._tail, self._count,
+            self._lock, self._not_empty, self._not_full,
+        )
+
+    def __setstate__(self, state):
+        (name, self._capacity, self._owner_pid,
+         self._head, self._tail, self._count,
+         self._lock, self._not_empty, self._not_full) = state
+        self._mask = self._capacity - 1
+        self._shm = _attach(name)
+        self._closed = False
+
+    # --- 送信 -----------------------------------------------------------------
+    def put(self, obj: Any, block: bool = True, timeout: Optional[float] = None) -> None:
+        self.put_bytes(encode_payload(obj), block, timeout)
+
+    def put_nowait(self, obj: Any) -> None:
+        self.put(obj, block=False)
+
+    def put_bytes(self, data: Union[bytes, bytearray], block: bool = True, timeout: Optional[float] = None) -> None:
+        """シリアライズ済みのペイロードをそのままリングへ書き込む。"""
+        self._put_chunk((data,), block, timeout)
+
+    def put_many(self, objs: Iterable[Any], block: bool = True, timeout: Optional[float] = None) -> int:
+        """複数オブジェクトをまとめて書き込む（符号化はロック外、書き込みは容量に収まる単位で1回のロック取得）。
+
+        Returns:
+            int: 書き込めた件数（空きが得られず途中で止まった場合は全件未満）
+        """
+        records = [encode_payload(o) for o in objs]
+        # 容量超過のレコードは途中まで書き込む前に検出する（部分送信は空き不足の場合のみ）
+        for r in records:
+            self._check_size(_LEN.size + len(r))
+        written = 0
+        for chunk in self._chunks(records):
+            try:
+                self._put_chunk(chunk, block, timeout)
+            except queue.Full:
+                break
+            written += len(chunk)
+        return written
+
+    # --- 受信 -----------------------------------------------------------------
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        return decode_payload(self.get_bytes(block, timeout))
+
+    def get_nowait(self) -> Any:
+        return self.get(block=False)
+
+    def get_bytes(self, block: bool = True, timeout: Optional[float] = None) -> bytes:
+        """先頭レコードのペイロードを bytes で取り出す。"""
+        with self._not_empty:
+            if not self._wait(self._not_empty, lambda: self._count.value > 0, block, timeout):
+                raise queue.Empty
+            return self._pop_locked()
+
+    def drain_bytes(self) -> List[bytes]:
+        """滞留している全レコードのペイロードを1回のロック取得で取り出す（復号は呼び出し側で1件ずつ）。"""
+        with self._lock:
+            n = int(self._count.value)
+            if n == 0:
+                return []
+            head = self._head.value
+            out: List[bytes] = []
+            for _ in range(n):
+                (length,) = _LEN.unpack(self._read(head, _LEN.size))
+                out.append(self._read(head + _LEN.size, length))
+                head += _LEN.size + length
+            self._head.value = head
+            self._count.value = 0
+            self._not_full.notify_all()
+            return out
+
+    # --- 状態 -----------------------------------------------------------------
+    def qsize(self) -> int:
+        return int(self._count.value)
+
+    def empty(self) -> bool:
+        return self._count.value == 0
+
+    def full(self) -> bool:
+        return self._free() <= _LEN.size
+
+    def close(self) -> None:
+        """このプロセスでのマッピングを解放する（生成プロセスでは共有メモリ名も削除）。"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._shm.close()
+        except Exception:
+            pass
+        if os.getpid() == self._owner_pid:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.debug("Shared memory unlink failed (suppressed): %s", e)
+
+    def join_thread(self) -> None:
+        """mp.Queue 互換。フィーダースレッドは存在しないため何もしない。"""
+        return None
+
+    # --- 内部 -----------------------------------------------------------------
+    def _put_chunk(self, records: Sequence[Union[bytes, bytearray]], block: bool, timeout: Optional[float]) -> None:
+        if self._closed:
+            raise ValueError("Queue is closed")
+        need = sum(_LEN.size + len(r) for r in records)
+        self._check_size(need)
+        with self._not_full:
+            if not self._wait(self._not_full, lambda: self._free() >= need, block, timeout):
+                raise queue.Full
+            tail = self._tail.value
+            for r in records:
+                self._write(tail, _LEN.pack(len(r)))
+                self._write(tail + _LEN.size, r)
+                tail += _LEN.size + len(r)
+            self._tail.value = tail
+            self._count.value += len(records)
+            # 複数件を書き込んだ場合は待機中のコンシューマをまとめて起こす
+            if len(records) == 1:
+                self._not_empty.notify()
+            else:
+                self._not_empty.notify_all()
+
+    def _check_size(self, need: int) -> None:
+        if need > self._capacity:
+            raise PayloadTooLargeError(f"Payload too large for ring ({need} bytes, capacity {self._capacity})")
+
+    def _chunks(self, records: List[Union[bytes, bytearray]]) -> Iterator[List[Union[bytes, bytearray]]]:
+        """リング容量に収まる連続区間へ分割する（単体で容量超過のレコードは _put_chunk で ValueError）。"""
+        chunk: List[Union[bytes, bytearray]] = []
+        size = 0
+        for r in records:
+            need = _LEN.size + len(r)
+            if chunk and size + need > self._capacity:
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(r)
+            size += need
+        if chunk:
+            yield chunk
+
+    def _free(self) -> int:
+        return self._capacity - (self._tail.value - self._head.value)
+
+    @staticmethod
+    def _wait(cond, predicate, block: bool, timeout: Optional[float]) -> bool:
+        if predicate():
+            return True
+        if not block:
+            return False
+        return cond.wait_for(predicate, timeout)
+
+    def _pop_locked(self) -> bytes:
+        head = self._head.value
+        (length,) = _LEN.unpack(self._read(head, _LEN.size))
+        data = self._read(head + _LEN.size, length)
+        self._head.value = head + _LEN.size + length
+        self._count.value -= 1
+        # 可変長のため待機中の全プロデューサに空き容量の再評価をさせる
+        self._not_full.notify_all()
+        return data
+
+    def _write(self, offset: int, data: Union[bytes, bytearray]) -> None:
+        buf = self._shm.buf
+        src = memoryview(data)
+        pos = offset & self._mask
+        first = min(len(src), self._capacity - pos)
+        buf[pos:pos + first] = src[:first]
+        if first < len(src):
+            buf[0:len(src) - first] = src[first:]
+
+    def _read(self, offset: int, n: int) -> bytes:
+        buf = self._shm.buf
+        pos = offset & self._mask
+        first = min(n, self._capacity - pos)
+        if first == n:
+            return bytes(buf[pos:pos + n])
+        return bytes(buf[pos:pos + first]) + bytes(buf[0:n - first])
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """既存の共有メモリへ接続する。
+
+    子プロセスは生成元の resource_tracker を共有するため登録は重複せず、unlink は生成元の close() のみが行う。
+    """
+    return shared_memory.SharedMemory(name=name)
@@ -10,6 +10,53 @@ from playwright.async_api import Page
 
 logger = logging.getLogger(__name__)
 
+# 通常ページ判定用の統計（要素数・テキスト長・HTML長）を返す JS 式（他の検出スクリプトに埋め込んで使用）。
+# 本文/HTML自体は転送しない。
+# テキスト長/HTML長は要素による判定で決まらない場合のみ計算する（未計算は -1）
+_NORMAL_PAGE_STATS_EXPR = """(() => {
+  const f = document.querySelectorAll('form, input, textarea, select').length;
+  const n = document.querySelectorAll('nav, header, footer, .header, .footer, .navigation').length;
+  if (f > 0 || n > 0) return {f: f, n: n, tl: -1, hl: -1};
+  const tl = document.body ? document.body.innerText.trim().length : 0;
+  const hl = document.documentElement ? document.documentElement.outerHTML.length : 0;
+  return {f: f, n: n, tl: tl, hl: hl};
+})()"""
+
+# reCAPTCHA 判定用の全シグナル（v2 可視判定 + v2 invisible/v3 の複合シグナル）
+_RECAPTCHA_JS = """() => {
+  const el = document.querySelector('.g-recaptcha');
+  let visible = false;
+  if (el) {
+    const s = getComputedStyle(el);
+    visible = !!s && s.display !== 'none' && s.visibility !== 'hidden';
+  }
+  return {
+    anchor: document.querySelectorAll('iframe[src*="recaptcha/api2/anchor"]').length,
+    sitekey: document.querySelectorAll('.g-recaptcha[data-sitekey]').length,
+    visible: visible,
+    s: document.querySelectorAll('script[src*="recaptcha/api.js"]').length,
+    i: document.querySelectorAll('iframe[src*="recaptcha"]').length,
+    g: document.querySelectorAll('[name="g-recaptcha-response"]').length,
+    b: document.querySelectorAll('.grecaptcha-badge, .g-recaptcha').length,
+    hasGrecaptcha: typeof window.grecaptcha !== 'undefined'
+  };
+}"""
+
+# Cloudflare Challenge 判定用。タイトル/要素条件を満たす場合のみ、通常ページ統計と
+# 必須テキストの有無（HTML はブラウザ内で検索し真偽値のみ返す）も同じ往復で取得する
+_CLOUDFLARE_JS = """() => {
+  const title = document.title;
+  const cf = document.querySelectorAll('.cf-browser-verification, #cf-wrapper').length;
+  if (title !== 'Just a moment...' || cf === 0) return {title: title, cf: cf, page: null, texts: null};
+  const h = document.documentElement ? document.documentElement.outerHTML : '';
+  return {
+    title: title,
+    cf: cf,
+    page: """ + _NORMAL_PAGE_STATS_EXPR + """,
+    texts: [h.includes('Cloudflare'), h.includes('Checking your browser')]
+  };
+}"""
+
 
 class BotDetectionThresholds:
     """Bot検知に使用する閾値定数"""
@@ -27,18 +74,16 @@ class BotDetectionSystem:
         """Bot保護システムを検出（reCAPTCHA/Cloudflareを先に評価）"""
         try:
             # Step 1: まず明示的な Bot 保護の存在を評価（通常ページ判定より先）
-            recaptcha_detected, recaptcha_type = await BotDetectionSystem._detect_strict_recaptcha(page)
+            recaptcha_detected, recaptcha_type = await _detect_strict_recaptcha(page)
             if recaptcha_detected:
                 return True, recaptcha_type
 
-            cloudflare_detected, cloudflare_type = await BotDetectionSystem._detect_strict_cloudflare(page)
+            cloudflare_detected, cloudflare_type = await _detect_strict_cloudflare(page)
             if cloudflare_detected:
                 return True, cloudflare_type
 
-            # Step 2: 通常ページの特徴が強ければ非Botとみなす
-            if await BotDetectionSystem._is_normal_page(page):
-                return False, None
-
+            # Step 2: 明示的な保護が無ければ通常ページの特徴の有無に関わらず非Bot
+            # （結果が同じため通常ページ判定の往復は行わない）
             return False, None
 
         except Exception as e:
@@ -46,153 +91,103 @@ class BotDetectionSystem:
             # エラー時は安全側（通常ページ）に倒す
             return False, None
 
-    @staticmethod
-    async def _is_normal_page(page: Page) -> bool:
-        """通常ページの特徴をチェック（除外条件）"""
-        try:
-            # フォーム要素の存在チェック
-            form_elements = await page.locator("form, input, textarea, select").count()
-            if form_elements > 0:
-                return True
-
-            # 通常のサイト構造要素
-            nav_elements = await page.locator(
-                "nav, header, footer, .header, .footer, .navigation"
-            ).count()
-            if nav_elements > 0:
-                return True
-
-            # パフォーマンス最適化: テキスト長を先にチェック
-            text_content = await page.locator("body").inner_text()
-            if (
-                len(text_content.strip())
-                > BotDetectionThresholds.NORMAL_PAGE_MIN_TEXT_LENGTH
-            ):
-                return True
-
-            # テキストが少ない場合のみHTMLコンテンツをチェック
-            page_content = await page.content()
-            if len(page_content) > BotDetectionThresholds.NORMAL_PAGE_MIN_HTML_LENGTH:
-                return True
-
-            return False
 
-        except Exception:
-            # エラー時は通常ページとして扱う（安全側）
-            return True
+def _judge_normal_page(stats: dict) -> bool:
+    """_NORMAL_PAGE_STATS_EXPR の結果から通常ページの特徴があるかを判定（除外条件）"""
+    # フォーム要素の存在チェック
+    if int(stats.get("f", 0) or 0) > 0:
+        return True
 
-    @staticmethod
-    async def _detect_strict_recaptcha(page: Page) -> Tuple[bool, Optional[str]]:
-        """reCAPTCHA検出（厳格→スコアリング緩和の2段構え）"""
-        try:
-            # 厳格: v2 visible（anchor iframe + .g-recaptcha 可視）- DOM往復削減のため evaluate に集約
-            try:
-                # 暗黙の文字列リテラル結合は Python パーサ差異で SyntaxError になり得るため
-                # 三重引用符の単一リテラルに変更して互換性を確保
-                rec = await page.evaluate(
-                    (
-                        """
-                        () => ({
-                          anchor: document.querySelectorAll('iframe[src*="recaptcha/api2/anchor"]').length,
-                          sitekey: document.querySelectorAll('.g-recaptcha[data-sitekey]').length,
-                          visible: !!document.querySelector('.g-recaptcha') && (function(el){
-                            const s = getComputedStyle(el);
-                            return s && s.display !== 'none' && s.visibility !== 'hidden';
-                          })(document.querySelector('.g-recaptcha'))
-                        })
-                        """
-                    ).strip()
-                )
-            except Exception:
-                rec = {"anchor": 0, "sitekey": 0, "visible": False}
-
-            recaptcha_iframe = int(rec.get("anchor", 0) or 0)
-            g_recaptcha_cnt = int(rec.get("sitekey", 0) or 0)
-            visible_recaptcha = bool(rec.get("visible", False))
-
-            if recaptcha_iframe > 0 and g_recaptcha_cnt > 0 and visible_recaptcha:
-                # v2可視が明確
-                return True, "reCAPTCHA"
-
-            # 緩和: v2 invisible / v3 など。複合シグナルの合算で判定。
-            signals = 0
-            # script / iframe 存在
-            try:
-                counts = await page.evaluate(
-                    (
-                        """
-                        () => ({
-                          s: document.querySelectorAll('script[src*="recaptcha/api.js"]').length,
-                          i: document.querySelectorAll('iframe[src*="recaptcha"]').length,
-                          g: document.querySelectorAll('[name="g-recaptcha-response"]').length,
-                          b: document.querySelectorAll('.grecaptcha-badge, .g-recaptcha').length
-                        })
-                        """
-                    ).strip()
-                )
-                if int(counts.get("s", 0) or 0) > 0:
-                    signals += 1
-                if recaptcha_iframe > 0 or int(counts.get("i", 0) or 0) > 0:
-                    signals += 1
-                if int(counts.get("g", 0) or 0) > 0:
-                    signals += 1
-                if int(counts.get("b", 0) or 0) > 0:
-                    signals += 1
-            except Exception:
-                pass
-
-            # window.grecaptcha があれば強いシグナル
-            try:
-                has_grecaptcha = await page.evaluate(
-                    "() => typeof window.grecaptcha !== 'undefined'"
-                )
-                if has_grecaptcha:
-                    signals += 1
-            except Exception:
-                pass
-
-            if signals >= 2:
-                return True, "reCAPTCHA"
+    # 通常のサイト構造要素
+    if int(stats.get("n", 0) or 0) > 0:
+        return True
 
-            return False, None
+    # テキスト長
+    if int(stats.get("tl", 0) or 0) > BotDetectionThresholds.NORMAL_PAGE_MIN_TEXT_LENGTH:
+        return True
 
-        except Exception:
-            return False, None
+    # テキストが少ない場合のみHTML長
+    if int(stats.get("hl", 0) or 0) > BotDetectionThresholds.NORMAL_PAGE_MIN_HTML_LENGTH:
+        return True
 
-    @staticmethod
-    async def _detect_strict_cloudflare(page: Page) -> Tuple[bool, Optional[str]]:
-        """厳格なCloudflare Challenge検出（複数条件をANDで組み合わせ）"""
-        try:
-            current_url = page.url
-            page_title = await page.title()
+    return False
 
-            # 条件1: Challenge URLの完全一致
-            if "/cdn-cgi/challenge-platform/" not in current_url:
-                return False, None
 
-            # 条件2: タイトルの完全一致
-            if page_title != "Just a moment...":
-                return False, None
+async def _detect_strict_recaptcha(page: Page) -> Tuple[bool, Optional[str]]:
+    """reCAPTCHA検出（厳格→スコアリング緩和の2段構え）"""
+    try:
+        # DOM 上の全シグナルを1回の evaluate でまとめて取得（CDP 往復は1回）
+        try:
+            rec = await page.evaluate(_RECAPTCHA_JS)
+        except Exception:
+            return False, None
 
-            # 条件3: Cloudflare特有の要素が存在
-            cf_elements = await page.locator(".cf-browser-verification, #cf-wrapper").count()
-            if cf_elements == 0:
-                return False, None
+        recaptcha_iframe = int(rec.get("anchor", 0) or 0)
+        g_recaptcha_cnt = int(rec.get("sitekey", 0) or 0)
+        visible_recaptcha = bool(rec.get("visible", False))
+
+        # 厳格: v2 visible（anchor iframe + .g-recaptcha 可視）
+        if recaptcha_iframe > 0 and g_recaptcha_cnt > 0 and visible_recaptcha:
+            # v2可視が明確
+            return True, "reCAPTCHA"
+
+        # 緩和: v2 invisible / v3 など。複合シグナルの合算で判定。
+        signals = 0
+        # script / iframe 存在
+        if int(rec.get("s", 0) or 0) > 0:
+            signals += 1
+        if recaptcha_iframe > 0 or int(rec.get("i", 0) or 0) > 0:
+            signals += 1
+        if int(rec.get("g", 0) or 0) > 0:
+            signals += 1
+        if int(rec.get("b", 0) or 0) > 0:
+            signals += 1
+        # window.grecaptcha があれば強いシグナル
+        if rec.get("hasGrecaptcha"):
+            signals += 1
+
+        if signals >= 2:
+            return True, "reCAPTCHA"
+
+        return False, None
+
+    except Exception:
+        return False, None
+
+
+async def _detect_strict_cloudflare(page: Page) -> Tuple[bool, Optional[str]]:
+    """厳格なCloudflare Challenge検出（複数条件をANDで組み合わせ）"""
+    try:
+        # 条件1: Challenge URLの完全一致（page.url は CDP 往復なしで参照できるため最初に判定）
+        if "/cdn-cgi/challenge-platform/" not in page.url:
+            return False, None
 
-            # 条件4: 通常ページの特徴をチェック（重複ロジック統合）
-            if await BotDetectionSystem._is_normal_page(page):
-                return False, None
+        # タイトル・Cloudflare 特有要素の数・通常ページ統計は1回の evaluate でまとめて取得
+        cf = await page.evaluate(_CLOUDFLARE_JS)
 
-            # 条件5: 特定のCloudflareテキストが存在（必要な場合のみページコンテンツ取得）
-            page_content = await page.content()
-            required_texts = ["Cloudflare", "Checking your browser"]
-            for text in required_texts:
-                if text not in page_content:
-                    return False, None
+        # 条件2: タイトルの完全一致
+        if cf.get("title") != "Just a moment...":
+            return False, None
 
-            # 全条件を満たした場合のみCloudflare Challenge検出
-            return True, "Cloudflare Challenge"
+        # 条件3: Cloudflare特有の要素が存在
+        if int(cf.get("cf", 0) or 0) == 0:
+            return False, None
 
+        # 条件4: 通常ページの特徴をチェック（重複ロジック統合）
+        try:
+            if _judge_normal_page(cf.get("page") or {}):
+                return False, None
         except Exception:
+            # エラー時は通常ページとして扱う（安全側）
             return False, None
 
+        # 条件5: 特定のCloudflareテキスト（"Cloudflare" / "Checking your browser"）が全て存在
+        texts = cf.get("texts") or ()
+        if not texts or not all(texts):
+            return False, None
+
+        # 全条件を満たした場合のみCloudflare Challenge検出
+        return True, "Cloudflare Challenge"
+
+    except Exception:
+        return False, None
@@ -0,0 +1,51 @@
+"""
+判定パターンの事前コンパイル
+
+config/form_detection_patterns.json を読み込み、小文字化済みのタプルを定数として持つ
+_patterns_compiled.py を生成する。パターンは配備時にしか変わらないため、
+各ワーカーの FormDetectionPatternMatcher はこの生成モジュールを優先して読み込み、
+JSON の解析と小文字化を省略する（JSON のハッシュが一致しない場合は JSON を読み直す）。
+
+使い方:
+    PYTHONPATH=src python -m form_sender.detection.build_patterns [config_path]
+"""
+
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .pattern_matcher import (
+    DEFAULT_CONFIG_PATH,
+    PATTERN_KEYS,
+    SCAN_LIMIT_CONST,
+    SCAN_LIMIT_KEY,
+    load_lowered_patterns,
+    patterns_version,
+)
+
+OUTPUT_PATH = Path(__file__).with_name("_patterns_compiled.py")
+
+
+def build(config_path: Optional[str] = None, output_path: Path = OUTPUT_PATH) -> Path:
+    """生成モジュールを書き出してそのパスを返す。"""
+    config_path = config_path or DEFAULT_CONFIG_PATH
+    with open(config_path, 'rb') as f:
+        raw = f.read()
+
+    lowered = load_lowered_patterns(raw)
+    lines = [
+        "# 自動生成ファイル: python -m form_sender.detection.build_patterns（手で編集しないこと）",
+        f"PATTERNS_VERSION = {patterns_version(raw)!r}",
+    ]
+    for key, const in PATTERN_KEYS:
+        lines.append(f"{const} = {tuple(lowered[key])!r}")
+    lines.append(f"{SCAN_LIMIT_CONST} = {lowered[SCAN_LIMIT_KEY]!r}")
+
+    tmp = output_path.with_suffix(".tmp")
+    tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    tmp.replace(output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    print(build(sys.argv[1] if len(sys.argv) > 1 else None))
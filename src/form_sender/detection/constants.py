@@ -4,6 +4,8 @@ Bot検出・関連判定で使う共有定数
 
 from typing import Tuple
 
+from ..utils.token_matcher import build_automaton, contains_any
+
 # ページ/エラーメッセージの簡易キーワード検出用（小文字で扱う前提）
 BOT_DETECTION_KEYWORDS: Tuple[str, ...] = (
     "recaptcha",
@@ -11,3 +13,12 @@ BOT_DETECTION_KEYWORDS: Tuple[str, ...] = (
     "bot",
 )
 
+# BOT_DETECTION_KEYWORDS の Aho–Corasick オートマトン（pyahocorasick 未導入時は None）
+_BOT_KEYWORDS_AUTOMATON = build_automaton(BOT_DETECTION_KEYWORDS)
+
+
+def contains_bot_keyword(text: str) -> bool:
+    """text（大文字小文字は問わない）が BOT_DETECTION_KEYWORDS のいずれかを含むか。"""
+    if not text:
+        return False
+    return contains_any(_BOT_KEYWORDS_AUTOMATON, BOT_DETECTION_KEYWORDS, text.lower())
@@ -4,98 +4,218 @@
 パフォーマンス最適化と設定外部化を実装した判定クラス
 """
 
+import hashlib
 import json
 import logging
 import os
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
+
+from ..utils.token_matcher import (
+    build_automaton,
+    build_literal_database,
+    contains_any,
+    scan_any,
+)
 
 logger = logging.getLogger(__name__)
 
+# 標準のパターン設定ファイル（プロジェクトルートの config 配下）
+DEFAULT_CONFIG_PATH = str(Path(__file__).parent.parent.parent.parent / "config" / "form_detection_patterns.json")
+
+# 本文判定で走査する先頭からの最大文字数の設定キー / 生成モジュールの定数名。
+# 未設定（null/0）なら全文を走査する。長大なページで走査量を抑えたい場合のみ設定する
+SCAN_LIMIT_KEY = "max_scan_chars"
+SCAN_LIMIT_CONST = "MAX_SCAN_CHARS"
+
+# 設定ファイルのキー -> 事前コンパイル済みモジュール（build_patterns が生成）の定数名
+PATTERN_KEYS = (
+    ("success_url_patterns", "SUCCESS_URL"),
+    ("success_content_patterns", "SUCCESS_CONTENT"),
+    ("error_url_patterns", "ERROR_URL"),
+    ("error_content_patterns", "ERROR_CONTENT"),
+    ("acceptable_redirect_patterns", "ACCEPTABLE_REDIRECT"),
+)
+
+
+def patterns_version(raw: bytes) -> str:
+    """設定ファイルの内容から事前コンパイル済みモジュールとの照合用バージョンを求める"""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def load_lowered_patterns(raw: bytes) -> Dict[str, Any]:
+    """設定ファイルの内容を解析し、キーごとに小文字化したパターンと走査上限（SCAN_LIMIT_KEY）を返す
+
+    pattern_priority に挙げたパターンは先頭へ移す（オートマトン未導入時の any(...) 走査は
+    先頭から照合して最初の一致で打ち切るため、一致しやすい・包含範囲の広いものを前に置く）。
+    """
+    patterns_config = json.loads(raw)
+    priority = patterns_config.get("pattern_priority", {})
+    lowered: Dict[str, Any] = {
+        key: _prioritized(
+            [p.lower() for p in patterns_config.get(key, [])],
+            [p.lower() for p in priority.get(key, [])],
+        )
+        for key, _ in PATTERN_KEYS
+    }
+    lowered[SCAN_LIMIT_KEY] = _scan_limit(patterns_config.get(SCAN_LIMIT_KEY))
+    return lowered
+
+
+def _scan_limit(value: Any) -> Optional[int]:
+    """走査上限の設定値を正規化（正の整数以外は上限なし）"""
+    if isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+        return None
+    return value
+
+
+def _prioritized(patterns: List[str], first: List[str]) -> List[str]:
+    """first のうち patterns に含まれるものを先頭へ移す（重複は最初の1件のみ残す）"""
+    present = set(patterns)
+    return list(dict.fromkeys([p for p in first if p in present] + patterns))
+
+
+def _intern_all(patterns: Iterable[str]) -> Tuple[str, ...]:
+    """読み込み後に変更しないパターン列を、intern 済み文字列のタプルに固める"""
+    return tuple(sys.intern(p) for p in patterns)
+
 
 class FormDetectionPatternMatcher:
     """フォーム送信結果判定用パターンマッチャー（最適化版）"""
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(self, config_path: Optional[str] = None, max_scan_chars: Optional[int] = None):
         """
         初期化
         
         Args:
             config_path: パターン設定ファイルのパス（省略時は標準パスを使用）
+            max_scan_chars: 本文判定で走査する先頭からの最大文字数（None/0 なら設定ファイルの
+                max_scan_chars に従い、そこも未設定なら全文）
         """
         self.config_path = config_path or self._get_default_config_path()
+        self._max_scan_chars_override = _scan_limit(max_scan_chars)
+        self.max_scan_chars: Optional[int] = self._max_scan_chars_override
         
         # パフォーマンス最適化：小文字変換を事前実行
-        self._success_url_patterns_lower: List[str] = []
-        self._success_content_patterns_lower: List[str] = []
-        self._error_url_patterns_lower: List[str] = []
-        self._error_content_patterns_lower: List[str] = []
-        self._acceptable_redirect_patterns_lower: List[str] = []
+        self._success_url_patterns_lower: Tuple[str, ...] = ()
+        self._success_content_patterns_lower: Tuple[str, ...] = ()
+        self._error_url_patterns_lower: Tuple[str, ...] = ()
+        self._error_content_patterns_lower: Tuple[str, ...] = ()
+        self._acceptable_redirect_patterns_lower: Tuple[str, ...] = ()
+
+        # 本文判定用の Aho–Corasick オートマトン（pyahocorasick 未導入時は None）。
+        # URL 判定は短い文字列に対する呼び出しのみのため、従来どおりの any(...) 走査とする
+        self._success_content_ac: Optional[Any] = None
+        self._error_content_ac: Optional[Any] = None
+        # 本文判定用の Hyperscan DB（hyperscan 導入時のみ。未導入時は上記オートマトンで判定）
+        self._success_content_db: Optional[Any] = None
+        self._error_content_db: Optional[Any] = None
+
+        # 読み込んだ設定ファイルの更新時刻（reload_patterns で未変更なら再読み込みを省略）
+        self._config_mtime_ns: Optional[int] = None
         
         # 設定読み込み
         self._load_patterns()
         
-        logger.info(f"FormDetectionPatternMatcher initialized with {len(self._success_url_patterns_lower)} success URL patterns, "
-                   f"{len(self._success_content_patterns_lower)} success content patterns")
+        logger.info(
+            "FormDetectionPatternMatcher initialized with %d success URL patterns, %d success content patterns",
+            len(self._success_url_patterns_lower),
+            len(self._success_content_patterns_lower),
+        )
 
     def _get_default_config_path(self) -> str:
         """標準設定ファイルパスを取得"""
-        # プロジェクトルートからの相対パス
-        current_dir = Path(__file__).parent
-        project_root = current_dir.parent.parent.parent
-        return str(project_root / "config" / "form_detection_patterns.json")
+        return DEFAULT_CONFIG_PATH
 
     def _load_patterns(self) -> None:
         """パターン設定ファイルからパターンを読み込み"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                patterns_config = json.load(f)
-            
-            # パフォーマンス最適化：事前に小文字化
-            self._success_url_patterns_lower = [p.lower() for p in patterns_config.get("success_url_patterns", [])]
-            self._success_content_patterns_lower = [p.lower() for p in patterns_config.get("success_content_patterns", [])]
-            self._error_url_patterns_lower = [p.lower() for p in patterns_config.get("error_url_patterns", [])]
-            self._error_content_patterns_lower = [p.lower() for p in patterns_config.get("error_content_patterns", [])]
-            self._acceptable_redirect_patterns_lower = [p.lower() for p in patterns_config.get("acceptable_redirect_patterns", [])]
+            with open(self.config_path, 'rb') as f:
+                mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+                raw = f.read()
+
+            # パフォーマンス最適化：事前コンパイル済みモジュールが同じ設定から生成されていれば
+            # JSON 解析と小文字化を省略する
+            lowered = self._load_compiled_patterns(raw)
+            source = "precompiled module"
+            if lowered is None:
+                lowered = load_lowered_patterns(raw)
+                source = self.config_path
+
+            self._success_url_patterns_lower = _intern_all(lowered["success_url_patterns"])
+            self._success_content_patterns_lower = _intern_all(lowered["success_content_patterns"])
+            self._error_url_patterns_lower = _intern_all(lowered["error_url_patterns"])
+            self._error_content_patterns_lower = _intern_all(lowered["error_content_patterns"])
+            self._acceptable_redirect_patterns_lower = _intern_all(lowered["acceptable_redirect_patterns"])
+            self.max_scan_chars = self._max_scan_chars_override or lowered.get(SCAN_LIMIT_KEY)
+            self._build_automata()
+            self._config_mtime_ns = mtime_ns
             
-            logger.info(f"Patterns loaded from {self.config_path}")
+            logger.info("Patterns loaded from %s", source)
             
         except FileNotFoundError:
-            logger.error(f"Pattern config file not found: {self.config_path}")
+            logger.error("Pattern config file not found: %s", self.config_path)
             self._use_fallback_patterns()
         except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in pattern config file: {e}")
+            logger.error("Invalid JSON in pattern config file: %s", e)
             self._use_fallback_patterns()
         except Exception as e:
-            logger.error(f"Error loading pattern config: {e}")
+            logger.error("Error loading pattern config: %s", e)
             self._use_fallback_patterns()
 
+    @staticmethod
+    def _load_compiled_patterns(raw: bytes) -> Optional[Dict[str, Any]]:
+        """build_patterns の生成モジュールを読み込む（未生成・設定と不一致なら None）"""
+        try:
+            from . import _patterns_compiled as compiled
+        except ImportError:
+            logger.info("Precompiled patterns not found; parsing JSON (run form_sender.detection.build_patterns)")
+            return None
+        if getattr(compiled, "PATTERNS_VERSION", None) != patterns_version(raw):
+            logger.warning("Precompiled patterns are stale for the current config; parsing JSON instead "
+                           "(re-run form_sender.detection.build_patterns)")
+            return None
+        patterns: Dict[str, Any] = {key: getattr(compiled, const) for key, const in PATTERN_KEYS}
+        patterns[SCAN_LIMIT_KEY] = getattr(compiled, SCAN_LIMIT_CONST, None)
+        return patterns
+
     def _use_fallback_patterns(self) -> None:
         """フォールバック用の基本パターンを使用"""
         logger.warning("Using fallback patterns due to config load failure")
+        self._config_mtime_ns = None
         
-        self._success_url_patterns_lower = [
+        self._success_url_patterns_lower = (
             "/thanks", "/thank-you", "/complete", "/completed", "/done", 
             "/submitted", "/success", "/confirm", "/confirmation",
             "/kanryou", "/uketsuke", "/arigatou", "完了", "受付", "成功"
-        ]
+        )
         
-        self._success_content_patterns_lower = [
+        self._success_content_patterns_lower = (
             "送信完了", "受付完了", "ありがとう", "完了しました", "thank you", 
             "submitted", "success", "successfully", "confirmation"
-        ]
+        )
         
-        self._error_url_patterns_lower = [
+        self._error_url_patterns_lower = (
             "/error", "/404", "/500", "/403", "/failed", "エラー", "失敗"
-        ]
+        )
         
-        self._error_content_patterns_lower = [
+        self._error_content_patterns_lower = (
             "エラー", "失敗", "error", "failed", "問題が発生", "something went wrong"
-        ]
+        )
         
-        self._acceptable_redirect_patterns_lower = [
+        self._acceptable_redirect_patterns_lower = (
             "/login", "/home", "/index", "/dashboard", "/"
-        ]
+        )
+        self._build_automata()
+
+    def _build_automata(self) -> None:
+        """小文字化済みの本文パターンからオートマトンを構築"""
+        self._success_content_ac = build_automaton(self._success_content_patterns_lower)
+        self._error_content_ac = build_automaton(self._error_content_patterns_lower)
+        self._success_content_db = build_literal_database(self._success_content_patterns_lower)
+        self._error_content_db = build_literal_database(self._error_content_patterns_lower)
 
     def is_success_url(self, url: str) -> bool:
         """
@@ -145,6 +265,19 @@ class FormDetectionPatternMatcher:
         url_lower = url.lower()
         return any(pattern in url_lower for pattern in self._acceptable_redirect_patterns_lower)
 
+    def prepare(self, content: str) -> str:
+        """
+        コンテンツを判定用に小文字化する
+
+        同一本文で成功/エラー両方を判定する場合はこの戻り値を *_prepared 系へ渡し、
+        全文の小文字化コピーを1回に抑える。max_scan_chars を超える部分は小文字化前に切り捨てる。
+        """
+        if not content:
+            return ""
+        if self.max_scan_chars is not None:
+            content = content[:self.max_scan_chars]
+        return content.lower()
+
     def contains_success_indicators(self, content: str) -> bool:
         """
         成功指標がコンテンツに含まれているかの判定（最適化版）
@@ -158,8 +291,13 @@ class FormDetectionPatternMatcher:
         if not content:
             return False
             
-        content_lower = content.lower()
-        return any(pattern in content_lower for pattern in self._success_content_patterns_lower)
+        return self.contains_success_indicators_prepared(self.prepare(content))
+
+    def contains_success_indicators_prepared(self, content_lower: str) -> bool:
+        """prepare() で小文字化済みのコンテンツに成功指標が含まれているかの判定"""
+        if self._success_content_db is not None:
+            return scan_any(self._success_content_db, content_lower)
+        return contains_any(self._success_content_ac, self._success_content_patterns_lower, content_lower)
 
     def contains_error_indicators(self, content: str) -> bool:
         """
@@ -174,8 +312,13 @@ class FormDetectionPatternMatcher:
         if not content:
             return False
             
-        content_lower = content.lower()
-        return any(pattern in content_lower for pattern in self._error_content_patterns_lower)
+        return self.contains_error_indicators_prepared(self.prepare(content))
+
+    def contains_error_indicators_prepared(self, content_lower: str) -> bool:
+        """prepare() で小文字化済みのコンテンツにエラー指標が含まれているかの判定"""
+        if self._error_content_db is not None:
+            return scan_any(self._error_content_db, content_lower)
+        return contains_any(self._error_content_ac, self._error_content_patterns_lower, content_lower)
 
     def get_pattern_stats(self) -> Dict[str, int]:
         """パターン統計情報を取得（デバッグ用）"""
@@ -187,17 +330,41 @@ class FormDetectionPatternMatcher:
             "acceptable_redirect_patterns": len(self._acceptable_redirect_patterns_lower)
         }
 
-    def reload_patterns(self) -> bool:
+    def reload_patterns(self, force: bool = False) -> bool:
         """
         パターンを再読み込み（運用時の設定変更対応）
+
+        設定ファイルの更新時刻が前回読み込み時から変わっていなければ何もしない。
         
+        Args:
+            force: 更新時刻に関わらず再読み込みする
+            
         Returns:
             bool: 再読み込みが成功したかどうか
         """
         try:
+            if not force and self._config_mtime_ns is not None:
+                try:
+                    if os.stat(self.config_path).st_mtime_ns == self._config_mtime_ns:
+                        return True
+                except OSError:
+                    pass
             self._load_patterns()
             logger.info("Patterns reloaded successfully")
             return True
         except Exception as e:
-            logger.error(f"Failed to reload patterns: {e}")
-            return False
\ No newline at end of file
+            logger.error("Failed to reload patterns: %s", e)
+            return False
+
+
+@lru_cache(maxsize=8)
+def get_matcher(
+    config_path: Optional[str] = None, max_scan_chars: Optional[int] = None
+) -> FormDetectionPatternMatcher:
+    """
+    設定ファイル・走査上限ごとにプロセス内で共有する FormDetectionPatternMatcher を取得
+
+    判定メソッドはインスタンスを変更しないため、呼び出し元間で共有してよい。
+    reload_patterns() は共有インスタンスをその場で更新するため、全呼び出し元に反映される。
+    """
+    return FormDetectionPatternMatcher(config_path, max_scan_chars)
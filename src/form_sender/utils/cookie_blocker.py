@@ -13,7 +13,7 @@ from __future__ import annotations
 
 import asyncio
 import re
-from typing import Iterable, Dict, Any, Optional, Tuple, List
+from typing import Iterable, Dict, Any, Optional, Sequence, Tuple, List, Union
 from urllib.parse import urlparse
 
 from playwright.async_api import BrowserContext, Page, Route, Frame, TimeoutError as PlaywrightTimeoutError
@@ -61,15 +61,8 @@ CMP_HOST_PATTERNS: Tuple[str, ...] = (
 
 # lower-cased cache for faster substring checks
 _CMP_PATTERNS_LC: Tuple[str, ...] = tuple(p.lower() for p in CMP_HOST_PATTERNS)
-
-
-def _url_matches_any(url: str, patterns: Iterable[str]) -> bool:
-    u = (url or "").lower()
-    # patterns is expected lower-cased; fall back if not
-    try:
-        return any(p in u for p in patterns)
-    except Exception:
-        return any((p or '').lower() in u for p in patterns)
+# 全CMPパターンを1本の正規表現に統合（リクエストごとのパターン数ぶんの走査を1回の検索に）
+_CMP_URL_RE = re.compile("|".join(re.escape(p) for p in _CMP_PATTERNS_LC))
 
 
 def _hostname(url: str) -> str:
@@ -79,15 +72,16 @@ def _hostname(url: str) -> str:
         return ""
 
 
-def _host_matches(host: str, patterns: Iterable[str]) -> bool:
-    h = (host or "").lower()
-    for p in patterns or []:
-        p = (p or "").lower().lstrip(".")
-        if not p:
-            continue
-        if h == p or h.endswith("." + p):
-            return True
-    return False
+def _compile_host_suffix_re(patterns: Optional[Iterable[str]]) -> Optional["re.Pattern[str]"]:
+    """ホスト名がパターンに完全一致するか、そのサブドメインであるかを判定する正規表現を事前コンパイル。
+
+    有効なパターンが無い場合は None。
+    """
+    norm = [(p or "").lower().lstrip(".") for p in patterns or []]
+    norm = [p for p in norm if p]
+    if not norm:
+        return None
+    return re.compile(r"(?:^|\.)(?:" + "|".join(re.escape(p) for p in norm) + r")$")
 
 
 def _registrable_domain(host: str) -> str:
@@ -137,41 +131,59 @@ async def install_init_script(context: BrowserContext, enabled: bool) -> None:
 
 
 async def install_cookie_routes(
-    page: Page,
+    target: Union[BrowserContext, Page],
     *,
     block_cmp_scripts: bool = True,
     strip_set_cookie: bool = False,
     resource_block_rules: Optional[Dict[str, bool]] = None,
     strip_set_cookie_third_party_only: bool = True,
-    strip_set_cookie_domains: Optional[List[str]] = None,
-    strip_set_cookie_exclude_domains: Optional[List[str]] = None,
+    strip_set_cookie_domains: Optional[Sequence[str]] = None,
+    strip_set_cookie_exclude_domains: Optional[Sequence[str]] = None,
 ) -> None:
     """ネットワークルーティングを設定。
 
     - CMPスクリプトのブロック（abort）
     - レスポンスの Set-Cookie ヘッダを除去（fulfill）
     - 既存のリソースブロック（画像/フォント/CSS）と共存
+
+    target に BrowserContext を渡すと配下の全ページに1回の登録で適用される
+    （main host はリクエスト元フレームのページから都度導出する）。
+    ドメイン指定は読み取り専用として扱う（呼び出し側は不変の tuple を共有で渡してよい）。
     """
 
     resource_block_rules = resource_block_rules or {}
+    # ドメイン指定はルート登録時に一度だけ正規化・コンパイル（リクエストごとの小文字化/走査を回避）
+    strip_re = _compile_host_suffix_re(strip_set_cookie_domains)
+    exclude_re = _compile_host_suffix_re(strip_set_cookie_exclude_domains)
     block_images = bool(resource_block_rules.get("images", False))
     block_fonts = bool(resource_block_rules.get("fonts", False))
     block_styles = bool(resource_block_rules.get("stylesheets", False))
 
+    page: Optional[Page] = target if isinstance(target, Page) else None
     # 呼び出し時の main host（about:blank の可能性を考慮し、ハンドラ内で都度取得も行う）
-    initial_main_url = getattr(page.main_frame, "url", "")
+    initial_main_url = getattr(page.main_frame, "url", "") if page is not None else ""
+
+    def _page_of(route: Route) -> Optional[Page]:
+        if page is not None:
+            return page
+        try:
+            return route.request.frame.page
+        except Exception:
+            # Service Worker 由来などフレームを持たないリクエスト
+            return None
 
     def _derive_main_host_for_request(route: Route, initial_url: str) -> str:
         """初回ナビゲーション直後でも安定して main_host を導出する。
 
         優先順:
-        1) page.main_frame.url（about:blank 以外）
+        1) page.main_frame.url（about:blank 以外。context 登録時はリクエスト元のページ）
         2) リクエストヘッダ Referer
         3) ドキュメント要求ならリクエストURL自体（第一者とみなす）
         4) route登録時の initial_main_url
         """
         try:
-            main_url_now = getattr(page.main_frame, "url", "") or ""
+            req_page = _page_of(route)
+            main_url_now = (getattr(req_page.main_frame, "url", "") or "") if req_page is not None else ""
             if main_url_now and not main_url_now.startswith("about:"):
                 return _hostname(main_url_now)
         except Exception:
@@ -193,7 +205,7 @@ async def install_cookie_routes(
             pass
         return _hostname(initial_url)
 
-    # registrable domain cache (per-page-instance)
+    # registrable domain cache (per-route-registration)
     _rd_cache: Dict[str, str] = {}
     _RD_CACHE_MAX = 256
 
@@ -232,7 +244,7 @@ async def install_cookie_routes(
                 pass
 
         # 2) CMP/同意管理スクリプトのブロック
-        if block_cmp_scripts and _url_matches_any(url, CMP_HOST_PATTERNS):
+        if block_cmp_scripts and _CMP_URL_RE.search(url.lower()):
             try:
                 await route.abort()
                 return
@@ -243,11 +255,11 @@ async def install_cookie_routes(
         if strip_set_cookie and r_type in ("document", "xhr", "fetch"):
             # 限定条件の判定（既定: 第三者のみ）。exclude に該当するホストは除外
             try:
-                if strip_set_cookie_exclude_domains and _host_matches(host, strip_set_cookie_exclude_domains):
+                if exclude_re is not None and exclude_re.search(host):
                     raise RuntimeError("exclude-domain")
                 should_strip = False
                 if strip_set_cookie_domains:
-                    should_strip = _host_matches(host, strip_set_cookie_domains)
+                    should_strip = strip_re is not None and strip_re.search(host) is not None
                 elif strip_set_cookie_third_party_only:
                     # 判定は eTLD+1（登録可能ドメイン）単位で行う（www/api 等の同一サイトサブドメインはファーストパーティ扱い）
                     rd_main = _rd_cached(main_host)
@@ -310,7 +322,7 @@ async def install_cookie_routes(
                 pass
 
     try:
-        await page.route("**/*", _route_handler)
+        await target.route("**/*", _route_handler)
     except Exception:
         # ルート設定に失敗しても致命ではない
         pass
@@ -453,7 +465,7 @@ def _prioritize_frames(frames: List[Frame]):
         except Exception:
             u = ""
         s = 0
-        if _url_matches_any(u, _CMP_PATTERNS_LC):
+        if _CMP_URL_RE.search(u):
             s += 2
         if any(k in u for k in ["consent", "cookie", "privacy", "gdpr"]):
             s += 1
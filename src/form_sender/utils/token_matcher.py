@@ -0,0 +1,88 @@
+"""複数トークンの部分一致判定ユーティリティ
+
+`any(p in text for p in patterns)` 形式の走査を、任意依存の pyahocorasick が
+利用可能な場合は Aho–Corasick オートマトンによる1パス走査に置き換える。
+未導入環境では従来どおりの any(...) 走査へフォールバックする（結果は同一）。
+大きな本文向けには、任意依存の hyperscan によるリテラル DB 走査も提供する。
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Iterable, Optional, Tuple
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # 任意依存（未導入時は純Python走査）
+    ahocorasick = None
+
+try:
+    import hyperscan  # type: ignore
+except ImportError:  # 任意依存（未導入時は build_literal_database が None を返す）
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
+
+def build_automaton(patterns: Iterable[str]) -> Optional[Any]:
+    """パターン集合から Aho–Corasick オートマトンを構築（未導入時は None）。"""
+    if ahocorasick is None:
+        return None
+    words = [p for p in patterns if p]
+    if not words:
+        return None
+    automaton = ahocorasick.Automaton()
+    for w in words:
+        automaton.add_word(w, w)
+    automaton.make_automaton()
+    return automaton
+
+
+def contains_any(automaton: Optional[Any], patterns: Tuple[str, ...], text: str) -> bool:
+    """text が patterns のいずれかを部分文字列として含むかを判定。"""
+    if not text:
+        return False
+    if automaton is not None:
+        return next(automaton.iter(text), None) is not None
+    return any(p in text for p in patterns)
+
+
+def build_literal_database(patterns: Iterable[str]) -> Optional[Any]:
+    """パターン集合を Hyperscan のブロックモード DB にコンパイル（未導入・コンパイル失敗時は None）。
+
+    パターンはリテラルとして扱い（正規表現メタ文字はエスケープ）、UTF-8 のバイト列で照合する。
+    """
+    if hyperscan is None:
+        return None
+    words = [p for p in patterns if p]
+    if not words:
+        return None
+    try:
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(
+            expressions=[re.escape(w).encode("utf-8") for w in words],
+            ids=list(range(len(words))),
+            elements=len(words),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(words),
+        )
+        return database
+    except Exception as e:
+        logger.debug("Hyperscan database compile failed (fallback to automaton): %s", e)
+        return None
+
+
+def _halt_scan(*_args: Any) -> bool:
+    # True を返すと走査を打ち切る（scan は ScanTerminated を送出する）
+    return True
+
+
+def scan_any(database: Any, text: str) -> bool:
+    """build_literal_database の DB で text を走査し、最初の一致で打ち切る。"""
+    if not text:
+        return False
+    try:
+        database.scan(text.encode("utf-8", "ignore"), match_event_handler=_halt_scan)
+    except hyperscan.ScanTerminated:
+        return True
+    return False
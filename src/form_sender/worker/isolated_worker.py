@@ -28,8 +28,8 @@ from config.manager import (
 )
 from config.manager import get_privacy_consent_config
 from ..detection.bot_detector import BotDetectionSystem
-from ..detection.constants import BOT_DETECTION_KEYWORDS
-from ..detection.pattern_matcher import FormDetectionPatternMatcher
+from ..detection.constants import contains_bot_keyword
+from ..detection.pattern_matcher import get_matcher
 from ..template.company_processor import CompanyPlaceholderAnalyzer
 from ..control.recovery_manager import AutoRecoveryManager
 from ..communication.queue_manager import QueueManager, WorkerResult, WorkerTask, ResultStatus, TaskType
@@ -50,6 +50,22 @@ from ..security.log_sanitizer import LogSanitizer
 
 logger = logging.getLogger(__name__)
 
+# ワーカー側のキュー書き込みの待機上限（秒）。共有メモリのリングは容量固定のため、満杯時は有限時間で諦める
+QUEUE_PUT_TIMEOUT_S = 30.0
+
+
+async def _queue_put(q, payload: Dict[str, Any], timeout: float = QUEUE_PUT_TIMEOUT_S) -> bool:
+    """キューへの書き込みをスレッドで待ち、イベントループ（ハートビート/ブラウザ）を止めない。
+
+    Returns:
+        bool: 書き込めたか（timeout 秒以内に空きが得られなければ False）
+    """
+    try:
+        await asyncio.to_thread(q.put, payload, True, timeout)
+        return True
+    except queue.Full:
+        return False
+
 
 class IsolatedFormWorker:
     """独立型フォーム送信ワーカー（プロセス分離版）"""
@@ -87,7 +103,7 @@ class IsolatedFormWorker:
         # フォーム処理コンポーネント
         self.bot_detector = BotDetectionSystem()
         self.recovery_manager = AutoRecoveryManager()
-        self.pattern_matcher = FormDetectionPatternMatcher()
+        self.pattern_matcher = get_matcher()
 
         # パフォーマンス最適化
         self._selector_cache = {}
@@ -212,11 +228,13 @@ class IsolatedFormWorker:
             if task_data.get("task_type") == TaskType.SHUTDOWN.value:
                 logger.info(f"Worker {self.worker_id}: SHUTDOWN task detected during processing")
                 # SHUTDOWNタスクをキューに戻す（他のチェックでも検出できるように）
-                self._task_queue.put(task_data)
+                if not await _queue_put(self._task_queue, task_data):
+                    logger.warning(f"Worker {self.worker_id}: Could not requeue SHUTDOWN task - queue full")
                 return True
             else:
                 # 他のタスクなのでキューに戻す
-                self._task_queue.put(task_data)
+                if not await _queue_put(self._task_queue, task_data):
+                    logger.error(f"Worker {self.worker_id}: Could not requeue task - queue full")
                 return False
         except queue.Empty:
             return False
@@ -611,7 +629,7 @@ class IsolatedFormWorker:
                             'error_location': 'page_access',
                             'page_url': form_url,
                             'is_timeout': 'timeout' in error_msg.lower(),
-                            'is_bot_detected': any(k in error_msg.lower() for k in BOT_DETECTION_KEYWORDS),
+                            'is_bot_detected': contains_bot_keyword(error_msg),
                         }
                         error_type = ErrorClassifier.classify_error_type(error_context)
                         return {
@@ -649,6 +667,11 @@ class IsolatedFormWorker:
                 except Exception as e:
                     logger.warning(f"Failed to close page for record_id {record_id}: {e}")
                 self.page = None
+            # コンテキストは閉じずにプールへ返却し、次の企業処理で再利用する
+            try:
+                await self.browser_manager.release_context()
+            except Exception as e:
+                logger.debug(f"Worker {self.worker_id}: context release failed for record_id {record_id}: {e}")
 
     # ===== small helpers =====
     def _get_dom_context(self):
@@ -2662,7 +2685,7 @@ def worker_process_main(worker_id: int, task_queue: mp.Queue, result_queue: mp.Q
             task_id=f"shutdown_{worker_id}", worker_id=worker_id, status=ResultStatus.WORKER_SHUTDOWN
         )
         try:
-            result_queue.put(shutdown_result.to_dict(), timeout=1)
+            await _queue_put(result_queue, shutdown_result.to_dict(), timeout=1)
         except:
             pass
 
@@ -2715,7 +2738,8 @@ def worker_process_main(worker_id: int, task_queue: mp.Queue, result_queue: mp.Q
             ready_result = WorkerResult(
                 task_id=f"ready_{worker_id}", worker_id=worker_id, status=ResultStatus.WORKER_READY
             )
-            result_queue.put(ready_result.to_dict())
+            if not await _queue_put(result_queue, ready_result.to_dict()):
+                logger.warning(f"Worker {worker_id}: Could not send READY - result queue full")
 
             logger.info(f"Worker {worker_id}: Ready and waiting for tasks")
 
@@ -2743,7 +2767,8 @@ def worker_process_main(worker_id: int, task_queue: mp.Queue, result_queue: mp.Q
                     if shutdown_event.is_set():
                         logger.info(f"Worker {worker_id}: Graceful shutdown requested, finishing current task")
                         # 現在のタスクをキューに戻す
-                        task_queue.put(task_data)
+                        if not await _queue_put(task_queue, task_data):
+                            logger.error(f"Worker {worker_id}: Could not requeue task on shutdown - queue full")
                         break
 
                     # 現在のタスク処理中であることを示す
@@ -2753,8 +2778,9 @@ def worker_process_main(worker_id: int, task_queue: mp.Queue, result_queue: mp.Q
                         # 企業処理タスク実行（SHUTDOWN監視付き）
                         result = await worker.process_company_task(task_data, task_queue)
 
-                        # 結果送信
-                        result_queue.put(result.to_dict())
+                        # 結果送信（未送信のタスクはマネージャー側の pending 回復で再送される）
+                        if not await _queue_put(result_queue, result.to_dict()):
+                            logger.error(f"Worker {worker_id}: Result dropped - result queue full for {QUEUE_PUT_TIMEOUT_S}s")
 
                     finally:
                         # タスク完了を通知
@@ -2795,7 +2821,8 @@ def worker_process_main(worker_id: int, task_queue: mp.Queue, result_queue: mp.Q
                     worker_id=worker_id,
                     status=ResultStatus.WORKER_READY,
                 )
-                result_queue.put(heartbeat_result.to_dict(), timeout=1)
+                if not await _queue_put(result_queue, heartbeat_result.to_dict(), timeout=1):
+                    logger.warning(f"Worker {worker_id}: Heartbeat skipped - result queue full")
 
                 # 次回まで待機
                 await asyncio.sleep(heartbeat_interval)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# src 配下のパッケージ（form_sender）を import 可能にする
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,48 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from form_sender.communication import codec
+
+
+def _sample():
+    return {
+        "task_id": "t-1",
+        "created_at": datetime.datetime(2024, 5, 1, 12, 30, 15),
+        "target_date": datetime.date(2024, 5, 2),
+        "amount": Decimal("12.50"),
+        "nested": [{"at": datetime.datetime(2024, 1, 1)}],
+    }
+
+
+@pytest.fixture(params=["msgspec", "pickle"])
+def codec_mode(request, monkeypatch):
+    if request.param == "msgspec":
+        if codec._ENCODER is None:
+            pytest.skip("msgspec is not installed")
+    else:
+        monkeypatch.setattr(codec, "_ENCODER", None)
+    return request.param
+
+
+def test_round_trip_preserves_datetime_date_decimal(codec_mode):
+    payload = _sample()
+
+    decoded = codec.decode_payload(codec.encode_payload(payload))
+
+    assert decoded == payload
+    assert type(decoded["created_at"]) is datetime.datetime
+    assert type(decoded["target_date"]) is datetime.date
+    assert type(decoded["amount"]) is Decimal
+    assert type(decoded["nested"][0]["at"]) is datetime.datetime
+
+
+def test_plain_payload_uses_msgpack_when_available(codec_mode):
+    payload = {"task_id": "t-1", "record_id": 3, "ok": True, "score": 0.5, "tags": ["a"], "extra": None}
+
+    data = codec.encode_payload(payload)
+
+    expected_tag = codec._TAG_MSGPACK if codec_mode == "msgspec" else codec._TAG_PICKLE
+    assert data[0] == expected_tag
+    assert codec.decode_payload(data) == payload
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+
+from form_sender.browser.context_pool import ContextPool  # noqa: E402
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.pages = []
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+def test_second_acquire_reuses_released_context():
+    async def scenario():
+        pool = ContextPool()
+        browser = object()
+        created = []
+
+        async def factory():
+            ctx = FakeContext(browser)
+            created.append(ctx)
+            return ctx
+
+        first, reused_first = await pool.acquire(browser, "k", factory)
+        page = FakePage()
+        first.pages.append(page)
+        await pool.release(first, "k")
+        second, reused_second = await pool.acquire(browser, "k", factory)
+        return first, reused_first, second, reused_second, created, page
+
+    first, reused_first, second, reused_second, created, page = _run(scenario())
+    assert reused_first is False
+    assert reused_second is True
+    assert second is first
+    assert len(created) == 1
+    assert page.closed  # 返却時に開いているページは閉じる
+    assert not first.closed
+
+
+def test_acquire_skips_context_of_other_browser():
+    async def scenario():
+        pool = ContextPool()
+        old_browser, new_browser = object(), object()
+        stale = FakeContext(old_browser)
+        await pool.release(stale, "k")
+
+        async def factory():
+            return FakeContext(new_browser)
+
+        ctx, reused = await pool.acquire(new_browser, "k", factory)
+        return stale, ctx, reused
+
+    stale, ctx, reused = _run(scenario())
+    assert reused is False
+    assert ctx is not stale
+    assert stale.closed
+
+
+def test_release_over_cap_closes_context():
+    async def scenario():
+        pool = ContextPool(max_idle_per_key=1)
+        browser = object()
+        a, b = FakeContext(browser), FakeContext(browser)
+        await pool.release(a, "k")
+        await pool.release(b, "k")
+        return a, b
+
+    a, b = _run(scenario())
+    assert not a.closed
+    assert b.closed
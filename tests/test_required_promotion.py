@@ -0,0 +1,44 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+
+from form_sender.analyzer.unmapped_element_handler import UnmappedElementHandler
+
+
+def _find(auto_handled, build):
+    handler = object.__new__(UnmappedElementHandler)
+    return asyncio.run(
+        handler._find_promotion(
+            auto_handled,
+            {},
+            prefix="auto_fullname",
+            target="統合氏名",
+            skip_if=lambda fm: "統合氏名" in fm,
+            build=build,
+        )
+    )
+
+
+async def _build_if_element(v):
+    return {"name": v["name"]} if v.get("element") else None
+
+
+def test_only_first_required_candidate_is_tried():
+    auto_handled = {
+        "auto_fullname_a": {"required": True, "element": None, "name": "a"},
+        "auto_fullname_b": {"required": True, "element": object(), "name": "b"},
+    }
+
+    assert _find(auto_handled, _build_if_element) is None
+
+
+def test_skips_optional_and_non_dict_entries():
+    auto_handled = {
+        "auto_fullname_x": "unexpected",
+        "auto_fullname_a": {"required": False, "element": object(), "name": "a"},
+        "auto_fullname_b": {"required": True, "element": object(), "name": "b"},
+    }
+
+    assert _find(auto_handled, _build_if_element) == ("auto_fullname_b", {"name": "b"})
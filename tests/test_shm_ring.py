@@ -0,0 +1,120 @@
+import queue
+
+import pytest
+
+from form_sender.communication.queue_manager import (
+    QueueManager,
+    QueueOverflowError,
+    ResultStatus,
+    WorkerResult,
+)
+from form_sender.communication.shm_ring import PayloadTooLargeError, ShmRingQueue
+
+
+@pytest.fixture
+def ring():
+    q = ShmRingQueue(capacity=256)
+    yield q
+    q.close()
+
+
+def test_roundtrip_preserves_order(ring):
+    for i in range(3):
+        ring.put({"i": i})
+    assert [ring.get_nowait()["i"] for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(queue.Empty):
+        ring.get_nowait()
+
+
+def test_full_ring_raises_queue_full(ring):
+    payload = {"data": "x" * 40}
+    with pytest.raises(queue.Full):
+        for _ in range(100):
+            ring.put_nowait(payload)
+    written = ring.qsize()
+    assert written > 0
+    # ブロッキング put もタイムアウトで queue.Full になる
+    with pytest.raises(queue.Full):
+        ring.put(payload, timeout=0.05)
+    # 取り出せば再び書き込める
+    ring.get_nowait()
+    ring.put_nowait(payload)
+    assert ring.qsize() == written
+
+
+def test_oversize_payload_raises(ring):
+    with pytest.raises(PayloadTooLargeError):
+        ring.put({"data": "x" * 1024})
+    assert ring.empty()
+
+
+def test_put_many_oversize_writes_nothing(ring):
+    with pytest.raises(PayloadTooLargeError):
+        ring.put_many([{"i": 0}, {"data": "x" * 1024}])
+    assert ring.empty()
+
+
+def test_put_many_partial_on_full(ring):
+    written = ring.put_many([{"data": "x" * 40}] * 20, block=False)
+    assert 0 < written < 20
+    assert ring.qsize() == written
+
+
+def _manager_with_small_ring():
+    qm = QueueManager(num_workers=1)
+    qm.task_queue.close()
+    qm.task_queue = ShmRingQueue(capacity=256)
+    return qm
+
+
+def test_send_task_oversize_maps_to_queue_overflow():
+    qm = _manager_with_small_ring()
+    try:
+        with pytest.raises(QueueOverflowError):
+            qm.send_task({"id": 1, "blob": "x" * 1024})
+        assert qm.pending_tasks == {}
+    finally:
+        qm.cleanup()
+
+
+def test_send_tasks_oversize_maps_to_queue_overflow():
+    qm = _manager_with_small_ring()
+    try:
+        with pytest.raises(QueueOverflowError):
+            qm.send_tasks([{"id": 1}, {"id": 2, "blob": "x" * 1024}])
+        assert qm.pending_tasks == {}
+        assert qm.task_queue.empty()
+    finally:
+        qm.cleanup()
+
+
+def test_undecodable_result_does_not_drop_the_rest():
+    qm = QueueManager(num_workers=1)
+    try:
+        ok = WorkerResult(task_id="t-1", worker_id=0, status=ResultStatus.SUCCESS)
+        qm.result_queue.put(ok.to_dict())
+        qm.result_queue.put_bytes(b"p\x00corrupt")
+        qm.result_queue.put(ok.to_dict() | {"task_id": "t-2"})
+
+        results = qm.get_all_available_results()
+
+        assert [r.task_id for r in results] == ["t-1", "t-2"]
+        assert qm.result_queue.empty()
+    finally:
+        qm.cleanup()
+
+
+def test_negative_worker_id_does_not_touch_other_slots():
+    qm = QueueManager(num_workers=2)
+    try:
+        before = bytes(qm.worker_status)
+        qm.result_queue.put(
+            WorkerResult(task_id="ready", worker_id=-1, status=ResultStatus.WORKER_READY).to_dict()
+        )
+
+        qm.get_all_available_results()
+
+        assert bytes(qm.worker_status) == before
+        assert list(qm.worker_last_heartbeat) == [0, 0]
+    finally:
+        qm.cleanup()